@@ -1,9 +1,9 @@
 from fastapi import APIRouter, HTTPException
 from app.models.chat import ChatRequest, ChatResponse
 from app.services.ai_agent import ai_agent
-from app.services.vehicle_service import vehicle_service
 import json
 import os
+import traceback
 
 router = APIRouter()
 
@@ -41,7 +41,6 @@ async def chat(request: ChatRequest):
     
     except Exception as e:
         print(f"Error processing chat: {e}")
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
@@ -5,7 +5,7 @@ Scoring API endpoint for testing catalog & scoring service
 from fastapi import APIRouter
 from pydantic import BaseModel
 from typing import List, Dict, Any, Optional
-from app.services.catalog_scoring import catalog_scoring_service
+from app.services.catalog_scoring import get_catalog_scoring_service
 
 router = APIRouter()
 
@@ -25,16 +25,17 @@ class UserProfile(BaseModel):
 @router.get("/cars")
 async def get_all_cars():
     """Get all cars from catalog"""
+    cars = get_catalog_scoring_service().get_all_cars()
     return {
-        "cars": catalog_scoring_service.get_all_cars(),
-        "count": len(catalog_scoring_service.get_all_cars())
+        "cars": cars,
+        "count": len(cars)
     }
 
 
 @router.post("/score")
 async def score_cars(profile: UserProfile):
     """Score cars based on user profile"""
-    scored_cars = catalog_scoring_service.score_cars_for_user(profile.dict())
+    scored_cars = get_catalog_scoring_service().score_cars_for_user(profile.dict())
     
     return {
         "user_profile": profile.dict(),
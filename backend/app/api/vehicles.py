@@ -1,9 +1,10 @@
 from fastapi import APIRouter, HTTPException, Query
 from typing import List, Optional
 import json
+import traceback
 from pathlib import Path
 from app.models.chat import Vehicle
-from app.services.vehicle_service import vehicle_service
+from app.services.vehicle_service import get_vehicle_service
 
 router = APIRouter()
 
@@ -17,13 +18,13 @@ async def get_all_vehicles(
     
     Returns a paginated list of all available vehicles
     """
-    all_vehicles = vehicle_service.get_all_vehicles()
+    all_vehicles = get_vehicle_service().get_all_vehicles()
     return all_vehicles[skip:skip + limit]
 
 @router.get("/vehicles/stats")
 async def get_vehicle_stats():
     """Get statistics about the vehicle catalog"""
-    return vehicle_service.get_catalog_stats()
+    return get_vehicle_service().get_catalog_stats()
 
 @router.get("/vehicles/search", response_model=List[Vehicle])
 async def search_vehicles(
@@ -43,7 +44,7 @@ async def search_vehicles(
     
     Apply multiple filters to find specific vehicles
     """
-    vehicles = vehicle_service.find_vehicles(
+    vehicles = get_vehicle_service().find_vehicles(
         model=model,
         body_style=body_style,
         fuel_type=fuel_type,
@@ -111,14 +112,13 @@ async def get_suggested_vehicles():
         return []
     except Exception as e:
         print(f"❌ Error reading suggested.json: {e}")
-        import traceback
         traceback.print_exc()
         return []
 
 @router.get("/vehicles/{vehicle_id}", response_model=Vehicle)
 async def get_vehicle_by_id(vehicle_id: str):
     """Get a single vehicle by ID"""
-    vehicle = vehicle_service.get_vehicle_by_id(vehicle_id)
+    vehicle = get_vehicle_service().get_vehicle_by_id(vehicle_id)
     if not vehicle:
         raise HTTPException(status_code=404, detail=f"Vehicle not found: {vehicle_id}")
     return vehicle
@@ -142,6 +142,5 @@ async def clear_suggested_vehicles():
         return {"status": "success", "message": "Suggested vehicles cleared"}
     except Exception as e:
         print(f"❌ Error clearing suggested.json: {e}")
-        import traceback
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Error clearing suggested vehicles: {str(e)}")
@@ -13,172 +13,22 @@ This ensures:
 """
 
 from typing import List, Dict, Any, Optional
+import asyncio
 import json
 import re
+import traceback
 from pathlib import Path
-from openai import OpenAI  # OpenAI SDK used for Nemotron API (compatible format)
+import httpx
+import orjson
+from openai import AsyncOpenAI  # OpenAI SDK used for Nemotron API (compatible format)
 from app.models.chat import ChatMessage
 from app.core.config import settings
-from app.services.catalog_scoring import catalog_scoring_service
+from app.services.catalog_scoring import get_catalog_scoring_service
 from app.services.financial_service import financial_service
 
-class AIAgent:
-    """AI Agent powered by NVIDIA Nemotron API + Toyota Catalog Service"""
-    
-    def __init__(self):
-        """Initialize the Nemotron client and catalog service"""
-        if settings.NEMOTRON_API_KEY:
-            self.client = OpenAI(
-                base_url="https://integrate.api.nvidia.com/v1",
-                api_key=settings.NEMOTRON_API_KEY
-            )
-        else:
-            self.client = None
-        
-        # Access to catalog scoring service
-        self.catalog = catalog_scoring_service
-        
-        # Define tools for Nemotron to call
-        self.tools = self._define_tools()
-        
-        # Path to suggested.json file
-        self.suggested_json_path = Path(__file__).parent.parent / "data" / "suggested.json"
-    
-    def _define_tools(self) -> List[Dict[str, Any]]:
-        """Define tools available to Nemotron for orchestration"""
-        return [
-            {
-                "type": "function",
-                "function": {
-                    "name": "score_cars_for_user",
-                    "description": "Score and rank Toyota vehicles based on user preferences. Use this when the user provides vehicle requirements like budget, passengers, priorities, features, or terrain. Returns a list of scored cars ranked by how well they match the user's needs.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "budget_max": {
-                                "type": "number",
-                                "description": "Maximum budget in dollars (base price or total cost)"
-                            },
-                            "passengers": {
-                                "type": "integer",
-                                "description": "Number of passengers needed"
-                            },
-                            "priorities": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "User priorities: fuel_efficiency, safety, space, performance, budget"
-                            },
-                            "features_wanted": {
-                                "type": "array",
-                                "items": {"type": "string"},
-                                "description": "Desired features: awd, hybrid, 3_row_seating, suv, sedan, truck, etc. If user mentions 'SUV', include 'suv' in this array."
-                            },
-                            "body_style": {
-                                "type": "string",
-                                "description": "Preferred body style: suv, sedan, truck, coupe, van, etc. Extract from user message (e.g., 'SUV' -> 'suv').",
-                                "enum": ["suv", "sedan", "truck", "coupe", "van", "hatchback"]
-                            },
-                            "terrain": {
-                                "type": "string",
-                                "description": "Driving terrain: city, highway, offroad, rough_city",
-                                "enum": ["city", "highway", "offroad", "rough_city"]
-                            },
-                            "commute_miles": {
-                                "type": "integer",
-                                "description": "One-way commute distance in miles"
-                            },
-                            "has_children": {
-                                "type": "boolean",
-                                "description": "Whether user has children (needs baby seat room)"
-                            },
-                            "needs_ground_clearance": {
-                                "type": "boolean",
-                                "description": "Whether user needs good ground clearance for potholes/speed bumps"
-                            },
-                            "weights": {
-                                "type": "object",
-                                "description": "Custom scoring weights (optional). Keys: budget, fuel_efficiency, seating, drivetrain, vehicle_type, performance, features, safety. Values should sum to ~1.0"
-                            }
-                        },
-                        "required": []
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "evaluate_affordability",
-                    "description": "Calculate affordability for a specific vehicle based on financial profile. Use this when the user provides financial information (income, credit score, down payment) and you want to check if a specific car is affordable. Returns monthly payment, DTI ratio, affordability score, and warnings.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "vehicle_id": {
-                                "type": "string",
-                                "description": "Car ID (e.g., 'prius-le-2020', 'camry-le-2018')"
-                            },
-                            "annual_income": {
-                                "type": "number",
-                                "description": "Annual income in dollars"
-                            },
-                            "monthly_income": {
-                                "type": "number",
-                                "description": "Monthly income in dollars"
-                            },
-                            "credit_score": {
-                                "type": ["integer", "string"],
-                                "description": "Credit score: numeric (300-850) or text (excellent, good, fair, poor)"
-                            },
-                            "down_payment": {
-                                "type": "number",
-                                "description": "Down payment amount in dollars"
-                            },
-                            "loan_term_months": {
-                                "type": "integer",
-                                "description": "Loan term in months (default: 60)"
-                            },
-                            "trade_in_value": {
-                                "type": "number",
-                                "description": "Trade-in value in dollars"
-                            }
-                        },
-                        "required": ["vehicle_id"]
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_all_cars",
-                    "description": "Get all Toyota vehicles from the catalog. Use this when you need to see the full catalog or search for specific vehicles.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {},
-                        "required": []
-                    }
-                }
-            },
-            {
-                "type": "function",
-                "function": {
-                    "name": "get_car_details",
-                    "description": "Get detailed information about a specific vehicle by ID. Use this when the user asks about a specific car or you need detailed specs for a vehicle.",
-                    "parameters": {
-                        "type": "object",
-                        "properties": {
-                            "vehicle_id": {
-                                "type": "string",
-                                "description": "Car ID (e.g., 'prius-le-2020', 'camry-le-2018')"
-                            }
-                        },
-                        "required": ["vehicle_id"]
-                    }
-                }
-            }
-        ]
-    
-    def _build_system_prompt(self) -> str:
-        """Build comprehensive system prompt for Nemotron with orchestration instructions"""
-        return """You are an intelligent Toyota vehicle advisor powered by NVIDIA Nemotron. Your role is to orchestrate workflows, call tools, and provide personalized car recommendations.
+# System prompt for Nemotron with orchestration instructions (constant, so the
+# system message for requests without a preference summary is shared)
+_SYSTEM_PROMPT = """You are an intelligent Toyota vehicle advisor powered by NVIDIA Nemotron. Your role is to orchestrate workflows, call tools, and provide personalized car recommendations.
 
 CRITICAL: YOU MUST CALL TOOLS TO GET DATA. DO NOT RESPOND WITHOUT CALLING TOOLS WHEN THE USER PROVIDES VEHICLE PREFERENCES.
 
@@ -260,13 +110,214 @@ CRITICAL RULES:
 - Be conversational but data-driven
 
 Available Toyota models include: Camry, Corolla, RAV4, Highlander, 4Runner, Tacoma, Tundra, Sienna, Sequoia, Prius, and their variants (hybrid, prime, etc.)."""
+_SYSTEM_MESSAGE = {"role": "system", "content": _SYSTEM_PROMPT}
+
+class AIAgent:
+    """AI Agent powered by NVIDIA Nemotron API + Toyota Catalog Service"""
+    
+    # Tools available to Nemotron for orchestration (built once, shared by every agent)
+    TOOLS: List[Dict[str, Any]] = [
+        {
+            "type": "function",
+            "function": {
+                "name": "score_cars_for_user",
+                "description": "Score and rank Toyota vehicles based on user preferences. Use this when the user provides vehicle requirements like budget, passengers, priorities, features, or terrain. Returns a list of scored cars ranked by how well they match the user's needs.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "budget_max": {
+                            "type": "number",
+                            "description": "Maximum budget in dollars (base price or total cost)"
+                        },
+                        "passengers": {
+                            "type": "integer",
+                            "description": "Number of passengers needed"
+                        },
+                        "priorities": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "User priorities: fuel_efficiency, safety, space, performance, budget"
+                        },
+                        "features_wanted": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Desired features: awd, hybrid, 3_row_seating, suv, sedan, truck, etc. If user mentions 'SUV', include 'suv' in this array."
+                        },
+                        "body_style": {
+                            "type": "string",
+                            "description": "Preferred body style: suv, sedan, truck, coupe, van, etc. Extract from user message (e.g., 'SUV' -> 'suv').",
+                            "enum": ["suv", "sedan", "truck", "coupe", "van", "hatchback"]
+                        },
+                        "terrain": {
+                            "type": "string",
+                            "description": "Driving terrain: city, highway, offroad, rough_city",
+                            "enum": ["city", "highway", "offroad", "rough_city"]
+                        },
+                        "commute_miles": {
+                            "type": "integer",
+                            "description": "One-way commute distance in miles"
+                        },
+                        "has_children": {
+                            "type": "boolean",
+                            "description": "Whether user has children (needs baby seat room)"
+                        },
+                        "needs_ground_clearance": {
+                            "type": "boolean",
+                            "description": "Whether user needs good ground clearance for potholes/speed bumps"
+                        },
+                        "weights": {
+                            "type": "object",
+                            "description": "Custom scoring weights (optional). Keys: budget, fuel_efficiency, seating, drivetrain, vehicle_type, performance, features, safety. Values should sum to ~1.0"
+                        }
+                    },
+                    "required": []
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "evaluate_affordability",
+                "description": "Calculate affordability for a specific vehicle based on financial profile. Use this when the user provides financial information (income, credit score, down payment) and you want to check if a specific car is affordable. Pass vehicle_ids instead of vehicle_id to check several cars against the same financial profile in one call. Returns monthly payment, DTI ratio, affordability score, and warnings (a list of results when vehicle_ids is used).",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "vehicle_id": {
+                            "type": "string",
+                            "description": "Car ID (e.g., 'prius-le-2020', 'camry-le-2018')"
+                        },
+                        "vehicle_ids": {
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "description": "Several car IDs to evaluate with the same financial profile (use instead of vehicle_id)"
+                        },
+                        "annual_income": {
+                            "type": "number",
+                            "description": "Annual income in dollars"
+                        },
+                        "monthly_income": {
+                            "type": "number",
+                            "description": "Monthly income in dollars"
+                        },
+                        "credit_score": {
+                            "type": ["integer", "string"],
+                            "description": "Credit score: numeric (300-850) or text (excellent, good, fair, poor)"
+                        },
+                        "down_payment": {
+                            "type": "number",
+                            "description": "Down payment amount in dollars"
+                        },
+                        "loan_term_months": {
+                            "type": "integer",
+                            "description": "Loan term in months (default: 60)"
+                        },
+                        "trade_in_value": {
+                            "type": "number",
+                            "description": "Trade-in value in dollars"
+                        }
+                    },
+                    "required": []
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "get_all_cars",
+                "description": "Get all Toyota vehicles from the catalog. Use this when you need to see the full catalog or search for specific vehicles.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {},
+                    "required": []
+                }
+            }
+        },
+        {
+            "type": "function",
+            "function": {
+                "name": "get_car_details",
+                "description": "Get detailed information about a specific vehicle by ID. Use this when the user asks about a specific car or you need detailed specs for a vehicle.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "vehicle_id": {
+                            "type": "string",
+                            "description": "Car ID (e.g., 'prius-le-2020', 'camry-le-2018')"
+                        }
+                    },
+                    "required": ["vehicle_id"]
+                }
+            }
+        }
+    ]
+    
+    # Chat messages sent to Nemotron per request (the system prompt is always kept)
+    MAX_HISTORY_MESSAGES = 20
+    
+    # User priority names -> scoring categories, for _priorities_to_weights
+    PRIORITY_CATEGORIES = {
+        'fuel_efficiency': 'fuel_efficiency',
+        'safety': 'safety',
+        'space': 'seating',  # Space maps to seating category (includes cargo)
+        'performance': 'performance',
+        'budget': 'budget',
+    }
+    
+    # Every scoring category, in the order weights are emitted
+    WEIGHT_CATEGORIES = ('budget', 'fuel_efficiency', 'seating', 'drivetrain',
+                         'vehicle_type', 'performance', 'features', 'safety')
+    
+    def __init__(self):
+        """Initialize the Nemotron client and catalog service"""
+        # The key can't change at runtime, so decide once whether it is usable.
+        # The .env.example placeholder counts as missing: every chat would
+        # otherwise make an API call that can only fail authentication.
+        api_key = settings.NEMOTRON_API_KEY
+        api_key_valid = bool(api_key) and not any(
+            placeholder in api_key.lower() for placeholder in ("your-nemotron", "your-key")
+        )
+        
+        if api_key_valid:
+            # Async client so Nemotron round-trips don't block the event loop
+            self.client = AsyncOpenAI(
+                base_url="https://integrate.api.nvidia.com/v1",
+                api_key=settings.NEMOTRON_API_KEY,
+                timeout=httpx.Timeout(60.0, connect=5.0),
+                # Keep-alive pool sized for concurrent chats, so TLS connections
+                # to the Nemotron endpoint are reused across requests
+                http_client=httpx.AsyncClient(
+                    transport=httpx.AsyncHTTPTransport(
+                        retries=2,  # Retry failed connection attempts
+                        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+                    )
+                )
+            )
+        else:
+            self.client = None
+        
+        # Tools for Nemotron to call (shared class-level schema, never mutated)
+        self.tools = self.TOOLS
+        
+        # Tool name -> handler, so _execute_tool is a single lookup
+        self._tool_handlers = {
+            "score_cars_for_user": self._tool_score_cars_for_user,
+            "evaluate_affordability": self._tool_evaluate_affordability,
+            "get_all_cars": self._tool_get_all_cars,
+            "get_car_details": self._tool_get_car_details,
+        }
+        
+        # Path to suggested.json file
+        self.suggested_json_path = Path(__file__).parent.parent / "data" / "suggested.json"
+    
+    @property
+    def catalog(self):
+        """Access to catalog scoring service (loaded on first use)"""
+        return get_catalog_scoring_service()
     
     def _convert_messages_to_nemotron_format(self, messages: List[ChatMessage]) -> List[Dict[str, str]]:
         """Convert ChatMessage list to Nemotron API format"""
-        formatted_messages = []
-        
         # Add system message with tool context
-        system_prompt = self._build_system_prompt()
+        system_message = _SYSTEM_MESSAGE
         
         # Extract current preferences to add context to system prompt
         if messages:
@@ -285,21 +336,16 @@ Available Toyota models include: Camry, Corolla, RAV4, Highlander, 4Runner, Taco
                 if current_preferences.get('features_wanted'):
                     pref_summary += f"- Features: {', '.join(current_preferences['features_wanted'])}\n"
                 pref_summary += "\nIMPORTANT: Focus on these CURRENT preferences. Ignore any conflicting old preferences from earlier messages.\n"
-                system_prompt = system_prompt + "\n\n" + pref_summary
-        
-        formatted_messages.append({
-            "role": "system",
-            "content": system_prompt
-        })
-        
-        # Convert chat history
-        for msg in messages:
-            formatted_messages.append({
-                "role": msg.role,
-                "content": msg.content
-            })
+                system_message = {
+                    "role": "system",
+                    "content": _SYSTEM_PROMPT + "\n\n" + pref_summary
+                }
         
-        return formatted_messages
+        # System message followed by the most recent chat history. Older turns are
+        # dropped to bound prompt size; their preferences are already carried in
+        # the summary above, which is extracted from the full conversation.
+        recent_messages = messages[-self.MAX_HISTORY_MESSAGES:]
+        return [system_message, *({"role": msg.role, "content": msg.content} for msg in recent_messages)]
     
     def _extract_all_preferences_from_conversation(self, messages: List[ChatMessage]) -> Dict[str, Any]:
         """
@@ -1231,13 +1277,7 @@ Available Toyota models include: Camry, Corolla, RAV4, Highlander, 4Runner, Taco
         - top_priority="space" → space gets 0.45, others get less
         """
         # Map priority names to scoring categories
-        priority_map = {
-            'fuel_efficiency': 'fuel_efficiency',
-            'safety': 'safety',
-            'space': 'seating',  # Space maps to seating category (includes cargo)
-            'performance': 'performance',
-            'budget': 'budget',
-        }
+        priority_map = self.PRIORITY_CATEGORIES
         
         # Base weights (reduced for non-priorities)
         base_weight = 0.06
@@ -1277,10 +1317,7 @@ Available Toyota models include: Camry, Corolla, RAV4, Highlander, 4Runner, Taco
                     weights[category] = weight_per_priority
         
         # Fill in remaining categories with base weight
-        all_categories = ['budget', 'fuel_efficiency', 'seating', 'drivetrain', 
-                         'vehicle_type', 'performance', 'features', 'safety']
-        
-        for category in all_categories:
+        for category in self.WEIGHT_CATEGORIES:
             if category not in weights:
                 weights[category] = base_weight
         
@@ -1292,11 +1329,7 @@ Available Toyota models include: Camry, Corolla, RAV4, Highlander, 4Runner, Taco
     
     def _get_car_details(self, car_id: str) -> Optional[Dict[str, Any]]:
         """Get full details for a specific car from catalog"""
-        all_cars = self.catalog.get_all_cars()
-        for car in all_cars:
-            if car['id'] == car_id:
-                return car
-        return None
+        return self.catalog.get_car_by_id(car_id)
     
     def _format_car_for_context(
         self, 
@@ -1371,130 +1404,148 @@ Financial Analysis:
             Tool execution result (dict or list)
         """
         try:
-            if tool_name == "score_cars_for_user":
-                # Call catalog scoring service
-                print(f"📊 Executing score_cars_for_user with arguments: {arguments}")
-                
-                # Handle body_style parameter - convert to vehicle_type for scoring service
-                # IMPORTANT: Use .get() and .pop() to safely handle, and make a copy to avoid modifying original
-                tool_args = arguments.copy() if isinstance(arguments, dict) else {}
-                
-                if "body_style" in tool_args:
-                    body_style = tool_args.pop("body_style")
-                    # Map body_style to vehicle_type for scoring
-                    body_style_to_vehicle_type = {
-                        "suv": "suv",
-                        "sedan": "sedan",
-                        "truck": "truck",
-                        "coupe": "coupe",
-                        "van": "van",
-                        "hatchback": "sedan"  # Hatchbacks are typically scored as sedans
-                    }
-                    if body_style in body_style_to_vehicle_type:
-                        tool_args["vehicle_type"] = body_style_to_vehicle_type[body_style]
-                        print(f"📊 Mapped body_style '{body_style}' to vehicle_type '{tool_args['vehicle_type']}'")
-                    # Update arguments dict for rest of processing
-                    arguments = tool_args
-                else:
-                    tool_args = arguments
-                
-                # Handle features_wanted - if "suv" is in features, also set vehicle_type
-                if "features_wanted" in tool_args and isinstance(tool_args.get("features_wanted"), list):
-                    features = tool_args["features_wanted"]
-                    if "suv" in [f.lower() for f in features] and "vehicle_type" not in tool_args:
-                        tool_args["vehicle_type"] = "suv"
-                        print(f"📊 Detected 'suv' in features_wanted, setting vehicle_type='suv'")
-                
-                # Handle electric feature - map to fuel_type for scoring
-                if "features_wanted" in tool_args and isinstance(tool_args.get("features_wanted"), list):
-                    features = [f.lower() for f in tool_args["features_wanted"]]
-                    if "electric" in features:
-                        # Electric vehicles should be filtered by fuel_type in scoring
-                        # The scoring service will check fuel_type, so we don't need to add it here
-                        # But we can add it to priorities to emphasize it
-                        if "priorities" not in tool_args:
-                            tool_args["priorities"] = []
-                        if "fuel_efficiency" not in tool_args["priorities"]:
-                            tool_args["priorities"].append("fuel_efficiency")
-                        print(f"📊 Detected 'electric' in features_wanted, emphasizing fuel efficiency")
-                
-                # Use tool_args (which has vehicle_type mapped correctly) for scoring
-                print(f"📊 Final tool arguments for scoring: {tool_args}")
-                result = self.catalog.score_cars_for_user(tool_args)
-                print(f"📊 Scoring service returned {len(result)} cars")
-                # Convert to list of dicts for JSON serialization
-                # Keep full car data for extraction, but limit to top 10
-                simplified_result = [{"id": car["id"], "score": car["score"], "reasons": car.get("reasons", [])} for car in result[:10]]
-                print(f"📊 Returning {len(simplified_result)} cars from scoring tool")
-                return simplified_result
-            
-            elif tool_name == "evaluate_affordability":
-                # Get car details first
-                vehicle_id = arguments.get("vehicle_id")
-                if not vehicle_id:
-                    return {"error": "vehicle_id is required"}
-                
-                car = self._get_car_details(vehicle_id)
-                if not car:
-                    return {"error": f"Vehicle {vehicle_id} not found"}
-                
-                # Create financial profile from arguments
-                financial_profile = {
-                    "annual_income": arguments.get("annual_income"),
-                    "monthly_income": arguments.get("monthly_income"),
-                    "credit_score": arguments.get("credit_score"),
-                    "down_payment": arguments.get("down_payment"),
-                    "loan_term_months": arguments.get("loan_term_months", 60),
-                    "trade_in_value": arguments.get("trade_in_value")
-                }
-                
-                # Remove None values
-                financial_profile = {k: v for k, v in financial_profile.items() if v is not None}
-                
-                # Evaluate affordability
-                affordability = financial_service.evaluate_affordability(car, financial_profile)
-                
-                # Return as dict for JSON serialization
-                return {
-                    "vehicle_id": vehicle_id,
-                    "monthly_payment": affordability.monthly_payment,
-                    "down_payment_required": affordability.down_payment_required,
-                    "total_cost_5yr": affordability.total_cost_5yr,
-                    "debt_to_income_ratio": affordability.debt_to_income_ratio,
-                    "affordability_score": affordability.affordability_score,
-                    "affordable": affordability.affordable,
-                    "warnings": affordability.warnings,
-                    "reasons": affordability.reasons
-                }
-            
-            elif tool_name == "get_all_cars":
-                # Get all cars from catalog
-                all_cars = self.catalog.get_all_cars()
-                # Return limited info for each car (to avoid huge responses)
-                return [{"id": car["id"], "make": car.get("make"), "model": car.get("model"), "year": car.get("year"), "trim": car.get("trim")} for car in all_cars[:50]]  # Limit to 50 for now
-            
-            elif tool_name == "get_car_details":
-                # Get car details by ID
-                vehicle_id = arguments.get("vehicle_id")
-                if not vehicle_id:
-                    return {"error": "vehicle_id is required"}
-                
-                car = self._get_car_details(vehicle_id)
-                if not car:
-                    return {"error": f"Vehicle {vehicle_id} not found"}
-                
-                # Return car details (full object)
-                return car
-            
-            else:
+            handler = self._tool_handlers.get(tool_name)
+            if handler is None:
                 return {"error": f"Unknown tool: {tool_name}"}
+            return handler(arguments)
         
         except Exception as e:
             print(f"Error executing tool {tool_name}: {e}")
-            import traceback
             traceback.print_exc()
             return {"error": f"Error executing tool {tool_name}: {str(e)}"}
     
+    def _tool_score_cars_for_user(self, arguments: Dict[str, Any]) -> Any:
+        """Score the catalog against the user's preferences and return the top 10"""
+        # Call catalog scoring service
+        print(f"📊 Executing score_cars_for_user with arguments: {arguments}")
+        
+        # Handle body_style parameter - convert to vehicle_type for scoring service
+        # IMPORTANT: Use .get() and .pop() to safely handle, and make a copy to avoid modifying original
+        tool_args = arguments.copy() if isinstance(arguments, dict) else {}
+        
+        if "body_style" in tool_args:
+            body_style = tool_args.pop("body_style")
+            # Map body_style to vehicle_type for scoring
+            body_style_to_vehicle_type = {
+                "suv": "suv",
+                "sedan": "sedan",
+                "truck": "truck",
+                "coupe": "coupe",
+                "van": "van",
+                "hatchback": "sedan"  # Hatchbacks are typically scored as sedans
+            }
+            if body_style in body_style_to_vehicle_type:
+                tool_args["vehicle_type"] = body_style_to_vehicle_type[body_style]
+                print(f"📊 Mapped body_style '{body_style}' to vehicle_type '{tool_args['vehicle_type']}'")
+            # Update arguments dict for rest of processing
+            arguments = tool_args
+        else:
+            tool_args = arguments
+        
+        # Handle features_wanted - if "suv" is in features, also set vehicle_type
+        if "features_wanted" in tool_args and isinstance(tool_args.get("features_wanted"), list):
+            features = tool_args["features_wanted"]
+            if "suv" in [f.lower() for f in features] and "vehicle_type" not in tool_args:
+                tool_args["vehicle_type"] = "suv"
+                print(f"📊 Detected 'suv' in features_wanted, setting vehicle_type='suv'")
+        
+        # Handle electric feature - map to fuel_type for scoring
+        if "features_wanted" in tool_args and isinstance(tool_args.get("features_wanted"), list):
+            features = [f.lower() for f in tool_args["features_wanted"]]
+            if "electric" in features:
+                # Electric vehicles should be filtered by fuel_type in scoring
+                # The scoring service will check fuel_type, so we don't need to add it here
+                # But we can add it to priorities to emphasize it
+                if "priorities" not in tool_args:
+                    tool_args["priorities"] = []
+                if "fuel_efficiency" not in tool_args["priorities"]:
+                    tool_args["priorities"].append("fuel_efficiency")
+                print(f"📊 Detected 'electric' in features_wanted, emphasizing fuel efficiency")
+        
+        # Use tool_args (which has vehicle_type mapped correctly) for scoring
+        print(f"📊 Final tool arguments for scoring: {tool_args}")
+        result = self.catalog.score_cars_for_user(tool_args, limit=10)
+        print(f"📊 Scoring service returned {len(result)} cars")
+        # Convert to list of dicts for JSON serialization, keeping the top 10
+        simplified_result = [{"id": car["id"], "score": car["score"], "reasons": car.get("reasons", [])} for car in result]
+        print(f"📊 Returning {len(simplified_result)} cars from scoring tool")
+        return simplified_result
+    
+    def _tool_evaluate_affordability(self, arguments: Dict[str, Any]) -> Any:
+        """Evaluate whether the user can afford a specific vehicle (or each of vehicle_ids)"""
+        vehicle_ids = arguments.get("vehicle_ids")
+        if not vehicle_ids:
+            vehicle_id = arguments.get("vehicle_id")
+            if not vehicle_id:
+                return {"error": "vehicle_id is required"}
+            return self._evaluate_affordability_for_ids([vehicle_id], arguments)[0]
+        return self._evaluate_affordability_for_ids(vehicle_ids, arguments)
+    
+    def _evaluate_affordability_for_ids(self, vehicle_ids: List[str], arguments: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Affordability result (or error) per vehicle id, evaluated as one batch"""
+        # Create financial profile from arguments
+        financial_profile = {
+            "annual_income": arguments.get("annual_income"),
+            "monthly_income": arguments.get("monthly_income"),
+            "credit_score": arguments.get("credit_score"),
+            "down_payment": arguments.get("down_payment"),
+            "loan_term_months": arguments.get("loan_term_months", 60),
+            "trade_in_value": arguments.get("trade_in_value")
+        }
+        
+        # Remove None values
+        financial_profile = {k: v for k, v in financial_profile.items() if v is not None}
+        
+        # Get car details first
+        cars = {vehicle_id: self._get_car_details(vehicle_id) for vehicle_id in vehicle_ids}
+        found_ids = [vehicle_id for vehicle_id, car in cars.items() if car]
+        
+        # Evaluate affordability (profile terms resolved once for the batch)
+        affordabilities = dict(zip(found_ids, financial_service.evaluate_affordability_batch(
+            [cars[vehicle_id] for vehicle_id in found_ids], financial_profile
+        )))
+        
+        # Return as dicts for JSON serialization
+        results = []
+        for vehicle_id in vehicle_ids:
+            affordability = affordabilities.get(vehicle_id)
+            if affordability is None:
+                results.append({"error": f"Vehicle {vehicle_id} not found"})
+                continue
+            results.append({
+                "vehicle_id": vehicle_id,
+                "monthly_payment": affordability.monthly_payment,
+                "down_payment_required": affordability.down_payment_required,
+                "total_cost_5yr": affordability.total_cost_5yr,
+                "debt_to_income_ratio": affordability.debt_to_income_ratio,
+                "affordability_score": affordability.affordability_score,
+                "affordable": affordability.affordable,
+                "warnings": affordability.warnings,
+                "reasons": affordability.reasons
+            })
+        return results
+    
+    def _tool_get_all_cars(self, arguments: Dict[str, Any]) -> Any:
+        """List basic info for the first 50 cars in the catalog"""
+        # Get all cars from catalog
+        all_cars = self.catalog.get_all_cars()
+        # Return limited info for each car (to avoid huge responses)
+        return [{"id": car["id"], "make": car.get("make"), "model": car.get("model"), "year": car.get("year"), "trim": car.get("trim")} for car in all_cars[:50]]  # Limit to 50 for now
+    
+    def _tool_get_car_details(self, arguments: Dict[str, Any]) -> Any:
+        """Return the full catalog entry for a vehicle"""
+        # Get car details by ID
+        vehicle_id = arguments.get("vehicle_id")
+        if not vehicle_id:
+            return {"error": "vehicle_id is required"}
+        
+        car = self._get_car_details(vehicle_id)
+        if not car:
+            return {"error": f"Vehicle {vehicle_id} not found"}
+        
+        # Return car details (full object)
+        return car
+    
     def _update_suggested_json(self, recommended_car_ids: List[str], clear_on_empty: bool = False) -> None:
         """
         Update suggested.json with full car data for recommended car IDs.
@@ -1558,7 +1609,6 @@ Financial Analysis:
             print(f"⚠️ Error parsing cars.json: {e}")
         except Exception as e:
             print(f"⚠️ Error updating suggested.json: {e}")
-            import traceback
             traceback.print_exc()
     
     def _extract_car_ids_from_nemotron_response(self, response_text: str, valid_car_ids: List[str]) -> List[str]:
@@ -1681,23 +1731,29 @@ Financial Analysis:
             recommended_car_ids_list = []
             scoring_method = None
             
-            # Tool call loop for multi-step workflow orchestration
+            # Tool call loop for multi-step workflow orchestration: up to
+            # max_iterations tool rounds, then one final round without tools
             max_iterations = 10
             iteration = 0
             
             print(f"🔄 Starting process_message with {len(formatted_messages)} messages")
             
-            while iteration < max_iterations:
+            while iteration <= max_iterations:
                 iteration += 1
-                print(f"🔄 Iteration {iteration}/{max_iterations}")
+                print(f"🔄 Iteration {iteration}/{max_iterations + 1}")
+                
+                # After max_iterations tool rounds the answer is forced, so tools are
+                # switched off for the final round instead of making an extra call after the loop
+                is_last_iteration = iteration > max_iterations
                 
                 # Call Nemotron API with tools
                 try:
-                    completion = self.client.chat.completions.create(
+                    completion = await self.client.chat.completions.create(
                         model="nvidia/nvidia-nemotron-nano-9b-v2",
                         messages=formatted_messages,
                         tools=self.tools,
-                        tool_choice="auto",  # Let Nemotron decide when to use tools
+                        # Let Nemotron decide when to use tools (force no more tool calls on the last round)
+                        tool_choice="none" if is_last_iteration else "auto",
                         temperature=settings.MODEL_TEMPERATURE,
                         max_tokens=settings.MAX_TOKENS,
                         stream=False,  # Tool calling requires non-streaming
@@ -1705,10 +1761,10 @@ Financial Analysis:
                     
                     # Get the assistant's message
                     message = completion.choices[0].message
-                    print(f"📨 Nemotron response: content={bool(message.content)}, tool_calls={len(message.tool_calls) if message.tool_calls else 0}")
+                    tool_calls = message.tool_calls
+                    print(f"📨 Nemotron response: content={bool(message.content)}, tool_calls={len(tool_calls) if tool_calls else 0}")
                 except Exception as e:
                     print(f"❌ Error calling Nemotron API: {e}")
-                    import traceback
                     traceback.print_exc()
                     raise
                 
@@ -1719,7 +1775,7 @@ Financial Analysis:
                 }
                 
                 # Add tool calls if any
-                if message.tool_calls:
+                if tool_calls:
                     assistant_message["tool_calls"] = [
                         {
                             "id": tc.id,
@@ -1728,13 +1784,13 @@ Financial Analysis:
                                 "name": tc.function.name,
                                 "arguments": tc.function.arguments,
                             }
-                        } for tc in message.tool_calls
+                        } for tc in tool_calls
                     ]
                 
                 formatted_messages.append(assistant_message)
                 
                 # If no tool calls, check if we should force a tool call based on user message
-                if not message.tool_calls:
+                if not tool_calls:
                     # ALWAYS extract preferences from the FULL conversation history
                     # This ensures we capture ALL preferences, including changes
                     print("🔍 Analyzing full conversation history for preferences...")
@@ -1824,18 +1880,23 @@ Financial Analysis:
                     
                     return (response_text, recommended_car_ids_list, scoring_method)
                 
-                # Execute tool calls
-                for tool_call in message.tool_calls:
+                # Execute tool calls (independent of each other, so run them concurrently)
+                tool_invocations = []
+                for tool_call in tool_calls:
                     tool_name = tool_call.function.name
                     try:
-                        tool_arguments = json.loads(tool_call.function.arguments)
-                    except json.JSONDecodeError:
+                        tool_arguments = orjson.loads(tool_call.function.arguments)
+                    except orjson.JSONDecodeError:
                         tool_arguments = {}
                     
                     print(f"🔧 Nemotron calling tool: {tool_name} with args: {tool_arguments}")
-                    
-                    # Execute the tool
-                    tool_result = self._execute_tool(tool_name, tool_arguments)
+                    tool_invocations.append(asyncio.to_thread(self._execute_tool, tool_name, tool_arguments))
+                
+                tool_results = await asyncio.gather(*tool_invocations)
+                
+                # Record results in the order Nemotron requested the tools
+                for tool_call, tool_result in zip(tool_calls, tool_results):
+                    tool_name = tool_call.function.name
                     
                     # Track car IDs from scoring tool calls
                     if tool_name == "score_cars_for_user":
@@ -1850,7 +1911,10 @@ Financial Analysis:
                     
                     # Add tool result to conversation
                     # Limit tool result size to avoid token limits
-                    tool_result_str = json.dumps(tool_result) if isinstance(tool_result, (dict, list)) else str(tool_result)
+                    if isinstance(tool_result, (dict, list)):
+                        tool_result_str = orjson.dumps(tool_result, option=orjson.OPT_NON_STR_KEYS).decode()
+                    else:
+                        tool_result_str = str(tool_result)
                     original_length = len(tool_result_str)
                     if original_length > 10000:  # Limit to ~10k chars
                         tool_result_str = tool_result_str[:10000] + "... (truncated)"
@@ -1871,36 +1935,12 @@ Financial Analysis:
                 
                 # Continue loop - Nemotron will process tool results and decide next steps
             
-            # If we've reached max iterations, force a final response
-            print(f"⚠️ Reached max iterations ({max_iterations}), forcing final response")
-            try:
-                final_completion = self.client.chat.completions.create(
-                    model="nvidia/nvidia-nemotron-nano-9b-v2",
-                    messages=formatted_messages,
-                    tools=self.tools,
-                    tool_choice="none",  # Force no more tool calls
-                    temperature=settings.MODEL_TEMPERATURE,
-                    max_tokens=settings.MAX_TOKENS,
-                )
-                
-                final_message = final_completion.choices[0].message
-                if final_message.content:
-                    response_text = final_message.content
-                    print(f"✅ Final forced response: {len(response_text)} chars")
-                else:
-                    # If still no content, generate based on what we have
-                    if recommended_car_ids_list:
-                        response_text = f"I've found {len(recommended_car_ids_list)} Toyota vehicles that match your preferences. Please check the recommendations on the right."
-                    else:
-                        response_text = "I'm here to help you find the perfect Toyota! Could you tell me more about what you're looking for?"
-                    print(f"⚠️ Final forced response had no content, using fallback: {len(response_text)} chars")
-            except Exception as e:
-                print(f"❌ Error forcing final response: {e}")
-                # Fallback response
-                if recommended_car_ids_list:
-                    response_text = f"I've found {len(recommended_car_ids_list)} Toyota vehicles that match your preferences. Please check the recommendations on the right."
-                else:
-                    response_text = "I encountered an issue processing your request. Please try again."
+            # Only reached if Nemotron kept requesting tools even on the tool-free last round
+            print(f"⚠️ Reached max iterations ({max_iterations}) without a final response")
+            if recommended_car_ids_list:
+                response_text = f"I've found {len(recommended_car_ids_list)} Toyota vehicles that match your preferences. Please check the recommendations on the right."
+            else:
+                response_text = "I'm here to help you find the perfect Toyota! Could you tell me more about what you're looking for?"
             
             # Update suggested.json with recommended cars (only if we have new recommendations)
             if recommended_car_ids_list:
@@ -1913,7 +1953,6 @@ Financial Analysis:
             
         except Exception as e:
             print(f"Error in process_message: {e}")
-            import traceback
             traceback.print_exc()
             return (f"I encountered an error while processing your request. Please try again.", [], None)
     
@@ -1984,24 +2023,21 @@ Financial Analysis:
                     # Use estimated base price for scoring, but keep original for context
                     scoring_profile["budget_max"] = scoring_profile["budget_max_estimated_base"]
                 
-                scored_cars = self.catalog.score_cars_for_user(scoring_profile)
                 # Adjust number of results based on user request
                 cars_to_fetch = num_results if wants_more else 8
-                top_cars = scored_cars[:cars_to_fetch]
+                top_cars = self.catalog.score_cars_for_user(scoring_profile, limit=cars_to_fetch)
                 scoring_method = "preference_based"
             elif has_vehicle_preferences:
                 # User has some preferences but not substantial - still show results
-                scored_cars = self.catalog.score_cars_for_user(user_profile)
                 cars_to_fetch = num_results if wants_more else 8
-                top_cars = scored_cars[:cars_to_fetch]
+                top_cars = self.catalog.score_cars_for_user(user_profile, limit=cars_to_fetch)
                 scoring_method = "preference_based"
             elif has_financial_info:
                 # User only provided financial info - show affordable cars
                 # Create a minimal profile to get all cars, then filter by affordability
-                scored_cars = self.catalog.score_cars_for_user({})  # Get all cars scored neutrally
                 # Get enough cars based on requested results (multiply by 2 to ensure we have enough after filtering)
                 cars_to_fetch = max(20, num_results * 2) if wants_more else 20
-                top_cars = scored_cars[:cars_to_fetch]
+                top_cars = self.catalog.score_cars_for_user({}, limit=cars_to_fetch)  # All cars scored neutrally
                 scoring_method = "affordability_based"
             else:
                 # No specific info - don't show recommendations yet
@@ -2026,28 +2062,31 @@ Financial Analysis:
             if top_cars:
                 # Filter and sort by affordability if financial info available
                 if has_financial_info and scoring_method == "affordability_based":
-                    # Score each car by affordability
+                    # Score each car by affordability (profile terms resolved once for the batch)
                     car_affordability = []
+                    candidates = []
                     for scored_car in top_cars:
                         car_details = self._get_car_details(scored_car['id'])
                         if car_details:
-                            affordability = financial_service.evaluate_affordability(
-                                car_details, financial_profile
+                            candidates.append((scored_car, car_details))
+                    affordabilities = financial_service.evaluate_affordability_batch(
+                        [car_details for _, car_details in candidates], financial_profile
+                    )
+                    for (scored_car, car_details), affordability in zip(candidates, affordabilities):
+                        # Only include cars that are affordable (or borderline acceptable)
+                        # Filter out cars with DTI > 18% (clearly unaffordable)
+                        if affordability.debt_to_income_ratio <= 0.18:
+                            # Combine affordability score with preference score (if any)
+                            combined_score = (
+                                affordability.affordability_score * 0.7 +  # Affordability is 70%
+                                scored_car['score'] * 0.3  # Base preference is 30%
                             )
-                            # Only include cars that are affordable (or borderline acceptable)
-                            # Filter out cars with DTI > 18% (clearly unaffordable)
-                            if affordability.debt_to_income_ratio <= 0.18:
-                                # Combine affordability score with preference score (if any)
-                                combined_score = (
-                                    affordability.affordability_score * 0.7 +  # Affordability is 70%
-                                    scored_car['score'] * 0.3  # Base preference is 30%
-                                )
-                                car_affordability.append({
-                                    'car': scored_car,
-                                    'details': car_details,
-                                    'affordability': affordability,
-                                    'combined_score': combined_score
-                                })
+                            car_affordability.append({
+                                'car': scored_car,
+                                'details': car_details,
+                                'affordability': affordability,
+                                'combined_score': combined_score
+                            })
                     
                     # Sort by combined score (affordability + preference)
                     car_affordability.sort(key=lambda x: x['combined_score'], reverse=True)
@@ -2062,24 +2101,28 @@ Financial Analysis:
                             recommended_car_ids_list.append(car_details['id'])
                 elif has_financial_info:
                     # User has both preferences and financial info
+                    # (profile terms resolved once for the batch)
                     car_affordability = []
+                    candidates = []
                     for scored_car in top_cars[:10]:
                         car_details = self._get_car_details(scored_car['id'])
                         if car_details:
-                            affordability = financial_service.evaluate_affordability(
-                                car_details, financial_profile
-                            )
-                            # Prioritize preference matches that are also affordable
-                            combined_score = (
-                                scored_car['score'] * 0.6 +  # Preference is 60%
-                                affordability.affordability_score * 0.4  # Affordability is 40%
-                            )
-                            car_affordability.append({
-                                'car': scored_car,
-                                'details': car_details,
-                                'affordability': affordability,
-                                'combined_score': combined_score
-                            })
+                            candidates.append((scored_car, car_details))
+                    affordabilities = financial_service.evaluate_affordability_batch(
+                        [car_details for _, car_details in candidates], financial_profile
+                    )
+                    for (scored_car, car_details), affordability in zip(candidates, affordabilities):
+                        # Prioritize preference matches that are also affordable
+                        combined_score = (
+                            scored_car['score'] * 0.6 +  # Preference is 60%
+                            affordability.affordability_score * 0.4  # Affordability is 40%
+                        )
+                        car_affordability.append({
+                            'car': scored_car,
+                            'details': car_details,
+                            'affordability': affordability,
+                            'combined_score': combined_score
+                        })
                     car_affordability.sort(key=lambda x: x['combined_score'], reverse=True)
                     top_cars_filtered = car_affordability[:10]
                     
@@ -2353,7 +2396,7 @@ Financial Analysis:
                 })
             
             # Call Nemotron API with streaming and reasoning
-            completion = self.client.chat.completions.create(
+            completion = await self.client.chat.completions.create(
                 model="nvidia/nvidia-nemotron-nano-9b-v2",
                 messages=formatted_messages,
                 temperature=settings.MODEL_TEMPERATURE,
@@ -2368,17 +2411,17 @@ Financial Analysis:
                 }
             )
             
-            # Collect the response (streaming)
-            response_content = ""
-            for chunk in completion:
-                # Handle reasoning content (thinking tokens)
-                reasoning = getattr(chunk.choices[0].delta, "reasoning_content", None)
-                if reasoning:
-                    pass  # Reasoning tokens handled but not returned
-                
-                # Collect actual response content
-                if chunk.choices[0].delta.content is not None:
-                    response_content += chunk.choices[0].delta.content
+            # Collect the response (streaming). Reasoning (thinking) tokens arrive in
+            # delta.reasoning_content and are not returned, so only content is read;
+            # chunks without choices (e.g. a trailing usage chunk) are skipped
+            content_parts = []
+            async for chunk in completion:
+                if not chunk.choices:
+                    continue
+                content = chunk.choices[0].delta.content
+                if content:
+                    content_parts.append(content)
+            response_content = "".join(content_parts)
             
             response_text = response_content.strip() if response_content.strip() else "I'm here to help you find the perfect Toyota!"
             
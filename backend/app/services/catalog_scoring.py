@@ -8,10 +8,173 @@ Flexible weight system allows Nemotron (Person B) to adjust priorities.
 Updated to work with comprehensive nested JSON format.
 """
 
-from typing import List, Dict, Any
-import json
+from typing import List, Dict, Any, Optional
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
 import re
+import sys
+import threading
 from pathlib import Path
+from types import SimpleNamespace
+import orjson
+
+
+# Reason tags in the order the scorer emits them. Each tag owns one bit, so a
+# car's reasons are collected as an int and only decoded to strings (once per
+# distinct mask, see _decode_reasons) when the ranking is built. Feature-match
+# reasons are the exception, see _FEATURE_MATCH below.
+_REASON_TAGS = (
+    # Budget
+    "within_budget",
+    "under_budget",
+    "budget_flexible",
+    "over_budget_but_flexible",
+    # Fuel efficiency
+    "eco_friendly",
+    "excellent_mpg",
+    "good_mpg",
+    "decent_mpg",
+    # Seating & cargo
+    "enough_seats",
+    "extra_space",
+    "child_seat_friendly",
+    "excellent_cargo_space",
+    "good_cargo_space",
+    "decent_cargo_space",
+    # Drivetrain
+    "awd_match",
+    # Vehicle type
+    None,  # matches_preferred_<vehicle_type>, named after the profile at decode time
+    "matches_preferred_suv",
+    "matches_preferred_sedan",
+    "good_clearance",
+    "excellent_clearance",
+    "decent_clearance",
+    "family_friendly",
+    "offroad_capable",
+    "efficient_highway_choice",
+    "comfortable_highway_choice",
+    "efficient_choice",
+    # Performance
+    "high_performance",
+    "good_power",
+    "adequate_power",
+    # Features (matches per wanted feature are kept apart, see _FEATURE_MATCH)
+    "feature_rich",
+    # Safety
+    "top_safety",
+    "excellent_safety",
+    "advanced_safety_features",
+)
+
+# Reason bits by tag name, e.g. _R.WITHIN_BUDGET
+_R = SimpleNamespace(**{tag.upper(): 1 << i for i, tag in enumerate(_REASON_TAGS) if tag})
+_R.MATCHES_PREFERRED_TYPE = 1 << _REASON_TAGS.index(None)
+
+# Feature-match reasons are emitted once per matching wanted feature, in the
+# order the features were asked for and repeats included, so they stay strings
+# and are spliced in just before feature_rich when decoded
+_FEATURE_MATCH = SimpleNamespace(
+    HAS_CARPLAY="has_carplay",
+    HAS_ADAPTIVE_CRUISE="has_adaptive_cruise",
+    HAS_LANE_ASSIST="has_lane_assist",
+    ECO_FRIENDLY="eco_friendly",
+    FULLY_ELECTRIC="fully_electric",
+)
+_BEFORE_FEATURE_MATCHES = _R.FEATURE_RICH - 1  # Bits of the tags emitted before them
+
+# Step-function lookup tables: bisect_right(thresholds, value) picks the bucket,
+# so each ">= threshold" ladder becomes a single table lookup.
+_MPG_LONG_COMMUTE_THRESHOLDS = (25, 30, 40)
+_MPG_LONG_COMMUTE_SCORES = (0.3, 0.6, 0.8, 1.0)
+_MPG_LONG_COMMUTE_REASONS = (0, _R.DECENT_MPG, _R.GOOD_MPG, _R.EXCELLENT_MPG)
+
+_PERFORMANCE_MPG_THRESHOLDS = (25, 30)  # Lower MPG = more powerful
+_PERFORMANCE_SCORES = (1.0, 0.8, 0.6)
+_PERFORMANCE_REASONS = (_R.HIGH_PERFORMANCE, _R.GOOD_POWER, 0)
+
+_SAFETY_THRESHOLDS = (0.7, 0.8, 0.9)
+_SAFETY_SCORES = (0.5, 0.7, 0.9, 1.0)
+_SAFETY_REASONS = (0, 0, _R.EXCELLENT_SAFETY, _R.TOP_SAFETY)
+
+# Integer codes for the categorical car fields. Each car's codes are computed
+# once at load time so scoring compares small ints instead of strings; values
+# missing from a table get -1, which never satisfies any check below.
+_DRIVETRAIN_CODES = {"FWD": 0, "RWD": 1, "AWD": 2, "4WD": 3}  # >= AWD means all wheels driven
+_CHILD_SEAT_CODES = {"poor": 0, "fair": 1, "good": 2, "excellent": 3}  # >= good fits a child seat
+_FUEL_CODES = {"gasoline": 0, "hybrid": 1, "plug_in_hybrid": 2, "electric": 3}  # >= hybrid is eco-friendly
+_BODY_CODES = {"sedan": 0, "hatchback": 1, "suv": 2, "crossover": 3, "truck": 4, "van": 5, "minivan": 6}
+
+_AWD = _DRIVETRAIN_CODES["AWD"]
+_GOOD_CHILD_SEAT_FIT = _CHILD_SEAT_CODES["good"]
+_HYBRID, _PLUG_IN_HYBRID, _ELECTRIC = _FUEL_CODES["hybrid"], _FUEL_CODES["plug_in_hybrid"], _FUEL_CODES["electric"]
+_SEDAN, _HATCHBACK, _SUV, _CROSSOVER, _TRUCK, _VAN, _MINIVAN = range(len(_BODY_CODES))
+
+# Body styles accepted by the strict vehicle_type filter
+_VEHICLE_TYPE_BODIES = {
+    "suv": (_SUV, _CROSSOVER),
+    "sedan": (_SEDAN, _HATCHBACK),
+    "truck": (_TRUCK,),
+    "van": (_VAN, _MINIVAN),
+}
+
+
+@dataclass(slots=True)
+class CarRecord:
+    """Flat, scoring-ready view of one catalog car (built once at load time)"""
+    id: str
+    year: int
+    price: float
+    mpg_city: float
+    mpg_hwy: float
+    seats: int
+    drivetrain_code: int
+    body_code: int
+    fuel_code: int
+    child_seat_code: int
+    safety_score: float
+    driver_assist: tuple[str, ...]
+    offroad_capable: bool
+    ground_clearance: float
+    cargo_volume_cuft: float
+    feature_bits: int
+
+
+@lru_cache(maxsize=4096)
+def _decode_reasons(mask: int, vehicle_type: str, feature_matches: tuple[str, ...] = ()) -> tuple[str, ...]:
+    """Reason tags whose bits are set in mask plus the feature-match reasons, in emission order"""
+    reasons = [
+        tag if tag is not None else sys.intern(f"matches_preferred_{vehicle_type}")
+        for i, tag in enumerate(_REASON_TAGS)
+        if mask >> i & 1
+    ]
+    if feature_matches:
+        split = (mask & _BEFORE_FEATURE_MATCHES).bit_count()
+        reasons[split:split] = feature_matches
+    return tuple(reasons)
+
+
+class _FrozenDict(tuple):
+    """Hashable stand-in for a dict inside a frozen profile key"""
+
+
+def _freeze(value: Any) -> Any:
+    """Convert a profile value into a hashable equivalent (dicts/lists -> tuples)"""
+    if isinstance(value, dict):
+        return _FrozenDict(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    """Inverse of _freeze"""
+    if isinstance(value, _FrozenDict):
+        return {k: _thaw(v) for k, v in value}
+    if isinstance(value, tuple):
+        return [_thaw(v) for v in value]
+    return value
 
 
 class CatalogScoringService:
@@ -29,15 +192,60 @@ class CatalogScoringService:
         "safety": 0.05
     }
     
+    # Defaults used when a vehicle_type is specified: vehicle type matching is
+    # prioritized by raising its weight to 0.30 (from 0.10) and scaling the
+    # other weights down by ~12.5% to keep the sum ~1.0
+    VEHICLE_TYPE_WEIGHTS = {
+        key: 0.30 if key == "vehicle_type" else weight * 0.875
+        for key, weight in DEFAULT_WEIGHTS.items()
+    }
+    
+    # Known features -> search terms. Each term is pre-split into the lowercase
+    # tokens that must all appear in a car's driver-assist token set.
+    FEATURE_SEARCH_TERMS = {
+        "apple_carplay": (("apple",), ("carplay",)),
+        "android_auto": (("android",), ("auto",)),
+        "leather_seats": (("leather",),),
+        "panoramic_sunroof": (("panoramic",), ("sunroof",)),
+        "sunroof": (("sunroof",),),
+        "blind_spot_monitor": (("blind", "spot"), ("blind_spot",)),
+        "adaptive_cruise": (("adaptive", "cruise"), ("adaptive_cruise_control",)),
+        "lane_departure": (("lane",), ("lane_keep",)),
+        "3_row_seating": (("3_row",), ("three_row",)),
+        "hybrid": (("hybrid",),),
+    }
+    
     def __init__(self):
         """Load car catalog on initialization"""
         self.cars = self._load_cars()
+        
+        # Give every driver-assist word in the catalog a bit, so each car's
+        # features pack into one int and a search term matches with a single AND
+        vocabulary = sorted(set().union(*(self._tokenize_driver_assist(car) for car in self.cars)))
+        self._token_bits = {token: 1 << i for i, token in enumerate(vocabulary)}
+        self._term_masks = lru_cache(maxsize=256)(self._build_term_masks)
+        
+        # Flatten every car into a CarRecord for scoring. Categorical fields are
+        # label-encoded; body styles outside _BODY_CODES get fresh codes so exact
+        # body_style matches still work.
+        self._body_codes = dict(_BODY_CODES)
+        self._records = [self._build_record(car) for car in self.cars]
+        self._catalog_positions = {record.id: i for i, record in enumerate(self._records)}
+        
+        # id -> car for direct lookups (the first car wins if an id is repeated)
+        self._cars_by_id: Dict[str, Dict[str, Any]] = {}
+        for car in self.cars:
+            self._cars_by_id.setdefault(car.get('id'), car)
+        
+        # Identical profiles always produce identical rankings, so memoize
+        # them per instance (the catalog is immutable for the process lifetime)
+        self._rank_cars_cached = lru_cache(maxsize=1024)(self._rank_frozen)
     
     def _load_cars(self) -> List[Dict[str, Any]]:
         """Load cars from JSON file"""
         catalog_path = Path(__file__).parent.parent / "data" / "cars.json"
-        with open(catalog_path, 'r') as f:
-            return json.load(f)
+        with open(catalog_path, 'rb') as f:
+            return orjson.loads(f.read())
     
     def get_all_cars(self) -> List[Dict[str, Any]]:
         """
@@ -48,123 +256,443 @@ class CatalogScoringService:
         """
         return self.cars
     
-    def score_cars_for_user(self, user_profile: Dict[str, Any]) -> List[Dict[str, Any]]:
+    def get_car_by_id(self, car_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a single car from the catalog
+        
+        Args:
+            car_id: Catalog id of the car
+            
+        Returns:
+            The car dictionary, or None if no car has that id
+        """
+        return self._cars_by_id.get(car_id)
+    
+    def score_cars_for_user(self, user_profile: Dict[str, Any], limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Score and rank cars based on user profile
         
         Args:
             user_profile: Dictionary with user preferences
+            limit: Return only the best `limit` cars (None returns every match)
         
         Returns:
             List of scored cars with reasons
         """
+        try:
+            ranked = self._rank_cars_cached(_freeze(user_profile), limit)
+        except TypeError:
+            # Profile holds an unhashable value or unsortable dict keys - score it without the cache
+            ranked = self._rank_cars(user_profile, limit)
+        
+        preferred_vehicle_type = user_profile.get("vehicle_type", "").lower()
+        print(f"📊 Scored {len(ranked)} cars (filtered by vehicle_type={preferred_vehicle_type if preferred_vehicle_type else 'none'})")
+        return [
+            {"id": car_id, "score": score, "reasons": list(reasons), "year": year}
+            for car_id, score, reasons, year in ranked
+        ]
+    
+    def _rank_frozen(self, profile_key: tuple, limit: Optional[int] = None) -> tuple:
+        """Rank the catalog for a frozen profile (see _freeze) - the cached entry point"""
+        return self._rank_cars(_thaw(profile_key), limit)
+    
+    def _rank_cars(self, user_profile: Dict[str, Any], limit: Optional[int] = None) -> tuple:
+        """
+        Score and rank the catalog for a user profile
+        
+        Returns:
+            Tuple of (id, score, reasons, year) entries, best match first,
+            cut to the first `limit` entries when a limit is given
+        """
+        weights = self._get_weights(user_profile)
         scored_cars = []
         preferred_vehicle_type = user_profile.get("vehicle_type", "").lower()
+        allowed_bodies = _VEHICLE_TYPE_BODIES.get(preferred_vehicle_type) or (
+            self._body_codes.get(preferred_vehicle_type, -1),
+        )
         
-        for car in self.cars:
+        # Cars priced over 1.5x the effective budget always get the minimum
+        # budget score, so their total is capped (see _get_over_budget_bound).
+        # They are scored last, and skipped when that cap can't reach the limit.
+        budget_cutoff = self._get_effective_budget(user_profile) * 1.5
+        over_budget = []
+        
+        for car in self._records:
             # STRICT FILTERING: If vehicle_type is specified, filter out non-matching vehicles BEFORE scoring
             # This ensures that if user wants SUV, we ONLY show SUVs (no sedans, no trucks, etc.)
             if preferred_vehicle_type:
-                body_style = self._get_body_style(car).lower()
-                matches_type = False
-                
-                if preferred_vehicle_type == "suv":
-                    matches_type = body_style in ["suv", "crossover"]
-                elif preferred_vehicle_type == "sedan":
-                    matches_type = body_style in ["sedan", "hatchback"]
-                elif preferred_vehicle_type == "truck":
-                    matches_type = body_style == "truck"
-                elif preferred_vehicle_type == "van":
-                    matches_type = body_style in ["van", "minivan"]
-                else:
-                    matches_type = body_style == preferred_vehicle_type
+                matches_type = car.body_code in allowed_bodies
                 
                 # Skip vehicles that don't match the preferred type
                 if not matches_type:
                     continue  # Don't score or include this car at all
             
+            if car.price > budget_cutoff:
+                over_budget.append(car)
+                continue
+            
             # Only score vehicles that match the type (or if no type specified, score all)
-            score, reasons = self._score_single_car(car, user_profile)
-            scored_cars.append({
-                "id": car["id"],
-                "score": round(score, 2),
-                "reasons": reasons,
-                "year": car.get("year", 0)  # Include year for tiebreaking
-            })
-        
-        # Sort by score descending, then by year descending (newest first) as tiebreaker
-        scored_cars.sort(key=lambda x: (x["score"], x["year"]), reverse=True)
-        
-        print(f"📊 Scored {len(scored_cars)} cars (filtered by vehicle_type={preferred_vehicle_type if preferred_vehicle_type else 'none'})")
-        return scored_cars
+            score, reasons, feature_matches = self._score_single_car(car, user_profile, weights)
+            scored_cars.append((
+                car.id,
+                round(score, 2),
+                _decode_reasons(reasons, preferred_vehicle_type, feature_matches),
+                car.year  # Include year for tiebreaking
+            ))
+        
+        if over_budget:
+            # Below the limit-th best in-budget score these cars rank past the
+            # limit (the margin covers rounding), so they are left out unscored
+            floor = None
+            if limit is not None and 0 < limit <= len(scored_cars):
+                floor = sorted((entry[1] for entry in scored_cars), reverse=True)[limit - 1]
+            if floor is None or self._get_over_budget_bound(user_profile, weights) >= floor - 0.01:
+                for car in over_budget:
+                    score, reasons, feature_matches = self._score_single_car(car, user_profile, weights)
+                    scored_cars.append((
+                        car.id,
+                        round(score, 2),
+                        _decode_reasons(reasons, preferred_vehicle_type, feature_matches),
+                        car.year
+                    ))
+        
+        # Sort by score descending, then by year descending (newest first) as tiebreaker;
+        # remaining ties keep catalog order even though over-budget cars were appended last
+        positions = self._catalog_positions
+        scored_cars.sort(key=lambda x: (x[1], x[3], -positions[x[0]]), reverse=True)
+        
+        return tuple(scored_cars[:limit])
     
     def _get_weights(self, profile: Dict[str, Any]) -> Dict[str, float]:
-        """Get weights from profile or use defaults"""
+        """
+        Get weights from profile or use defaults
+        
+        Without custom weights (the common case) the shared default table is
+        returned as-is, so the result must be treated as read-only.
+        """
         custom_weights = profile.get("weights") or {}
-        weights = self.DEFAULT_WEIGHTS.copy()
-        
-        # If vehicle_type is specified, increase its weight significantly
-        # This ensures vehicle type matching is prioritized
-        if profile.get("vehicle_type"):
-            # Increase vehicle_type weight to 0.30 (from 0.10)
-            # Reduce other weights proportionally to maintain sum ~1.0
-            weights["vehicle_type"] = 0.30
-            # Reduce other weights slightly
-            for key in weights:
-                if key != "vehicle_type":
-                    weights[key] = weights[key] * 0.875  # Scale down by ~12.5%
-        
-        if custom_weights:
-            weights.update(custom_weights)
+        
+        # If vehicle_type is specified, use the table that prioritizes it
+        defaults = self.VEHICLE_TYPE_WEIGHTS if profile.get("vehicle_type") else self.DEFAULT_WEIGHTS
+        if not custom_weights:
+            return defaults
+        
+        weights = defaults.copy()
+        weights.update(custom_weights)
         return weights
     
-    def _score_single_car(self, car: Dict[str, Any], profile: Dict[str, Any]) -> tuple[float, List[str]]:
-        """Score a single car against user profile"""
+    def _get_effective_budget(self, profile: Dict[str, Any]) -> float:
+        """Price ceiling the budget score is measured against"""
+        budget_max = profile.get("budget_max", 50000)
+        budget_is_total_cost = profile.get("budget_is_total_cost", False)
+        budget_flexible = profile.get("budget_flexible", False)
+        
+        # If budget is total cost and flexible, be more lenient
+        if budget_is_total_cost and budget_flexible:
+            # For flexible total cost budgets, allow up to 15% over (since base price + taxes/fees = total)
+            return budget_max * 1.15
+        elif budget_is_total_cost:
+            # For strict total cost budgets, estimate base price (budget_max already accounts for taxes)
+            # The scoring profile should have budget_max_estimated_base, but if not, use 88% of total
+            return profile.get("budget_max_estimated_base", int(budget_max * 0.88))
+        elif budget_flexible:
+            # Flexible base price budget - allow 10% over
+            return budget_max * 1.10
+        else:
+            # Strict base price budget
+            return budget_max
+    
+    def _get_over_budget_bound(self, profile: Dict[str, Any], weights: Dict[str, float]) -> float:
+        """Highest total score a car on the minimum budget score can reach for this profile"""
+        priorities = profile.get("priorities", [])
+        features_wanted = profile.get("features_wanted", [])
+        wants_awd = "awd" in features_wanted or profile.get("terrain", "mixed") == "offroad"
+        
+        # A wanted feature can count a driver-assist match plus the hybrid and
+        # electric fuel checks, so the features score can go past 1.0
+        if features_wanted:
+            features_max = sum(
+                1 + ("hybrid" in wanted.lower()) + ("electric" in wanted.lower())
+                for wanted in features_wanted
+            ) / len(features_wanted)
+        else:
+            features_max = 0.7
+        
+        # Categories whose score is fixed for this profile contribute that value, others at most 1.0
+        category_max = {
+            "budget": 0.2,
+            "fuel_efficiency": 1.0 if profile.get("commute_miles", 0) > 30 else 0.7,
+            "drivetrain": 1.0 if wants_awd else 0.8,
+            "performance": 1.0 if "performance" in priorities or "power" in priorities else 0.7,
+            "features": features_max,
+        }
+        return sum(max(weight * category_max.get(category, 1.0), 0.0) for category, weight in weights.items())
+    
+    def _score_single_car(
+        self,
+        car: CarRecord,
+        profile: Dict[str, Any],
+        weights: Dict[str, float]
+    ) -> tuple[float, int, tuple[str, ...]]:
+        """
+        Score a single car against user profile
+        
+        All eight category scores are computed in one pass over the car's
+        flattened CarRecord fields. Reasons come back as a bitmask over
+        _REASON_TAGS plus a tuple of feature-match reasons (see _decode_reasons).
+        """
         score = 0.0
-        reasons = []
-        weights = self._get_weights(profile)
+        reasons = 0
+        
+        # Car fields used by the categories below
+        price = car.price
+        avg_mpg = (car.mpg_city + car.mpg_hwy) / 2
+        seats = car.seats
+        body_code = car.body_code
+        fuel_code = car.fuel_code
+        ground_clearance = car.ground_clearance
+        
+        # Profile fields shared by several categories
+        priorities = profile.get("priorities", [])
+        features_wanted = profile.get("features_wanted", [])
+        terrain = profile.get("terrain", "mixed")
+        has_children = profile.get("has_children", False)
+        top_priority = profile.get("top_priority")
         
         # 1. Budget scoring
-        budget_score, budget_reasons = self._score_budget(car, profile)
+        budget_flexible = profile.get("budget_flexible", False)
+        effective_budget = self._get_effective_budget(profile)
+        
+        if price <= effective_budget:
+            budget_score = 1.0 - (price / effective_budget) * 0.3
+            reasons |= _R.WITHIN_BUDGET
+            if price <= effective_budget * 0.8:
+                reasons |= _R.UNDER_BUDGET
+            if budget_flexible:
+                reasons |= _R.BUDGET_FLEXIBLE
+        elif budget_flexible and price <= effective_budget * 1.2:
+            # If budget is flexible, still give some score even if over
+            budget_score = 0.5
+            reasons |= _R.OVER_BUDGET_BUT_FLEXIBLE
+        else:
+            budget_score = 0.2
         score += weights["budget"] * budget_score
-        reasons.extend(budget_reasons)
         
         # 2. Fuel efficiency scoring
-        mpg_score, mpg_reasons = self._score_fuel_efficiency(car, profile)
+        commute = profile.get("commute_miles", 0)
+        
+        # Check if hybrid/electric
+        if fuel_code >= _HYBRID:
+            reasons |= _R.ECO_FRIENDLY
+        
+        if commute > 30:
+            bucket = bisect_right(_MPG_LONG_COMMUTE_THRESHOLDS, avg_mpg)
+            reasons |= _MPG_LONG_COMMUTE_REASONS[bucket]
+            mpg_score = _MPG_LONG_COMMUTE_SCORES[bucket]
+        else:
+            if avg_mpg >= 30:
+                reasons |= _R.GOOD_MPG
+            mpg_score = 0.7
         score += weights["fuel_efficiency"] * mpg_score
-        reasons.extend(mpg_reasons)
         
-        # 3. Seating capacity scoring
-        seating_score, seating_reasons = self._score_seating(car, profile)
+        # 3. Seating capacity scoring (plus cargo space when space is a priority)
+        passengers_needed = profile.get("passengers", 5)
+        seating_score = 1.0
+        if seats >= passengers_needed:
+            reasons |= _R.ENOUGH_SEATS
+            if seats >= passengers_needed + 2:
+                reasons |= _R.EXTRA_SPACE
+            
+            # Bonus for good child seat fit if has children
+            if has_children and car.child_seat_code >= _GOOD_CHILD_SEAT_FIT:
+                reasons |= _R.CHILD_SEAT_FRIENDLY
+        else:
+            seating_score = 0.2
+        
+        if "space" in priorities or top_priority == "space":
+            # If space is a priority, heavily weight cargo volume
+            # Large cargo: >20 cu ft = excellent, 15-20 = good, 10-15 = decent, <10 = poor
+            cargo_volume_cuft = car.cargo_volume_cuft
+            if cargo_volume_cuft >= 20:
+                reasons |= _R.EXCELLENT_CARGO_SPACE
+                cargo_score = 1.0
+            elif cargo_volume_cuft >= 15:
+                reasons |= _R.GOOD_CARGO_SPACE
+                cargo_score = 0.9
+            elif cargo_volume_cuft >= 12:
+                reasons |= _R.DECENT_CARGO_SPACE
+                cargo_score = 0.7
+            else:
+                cargo_score = 0.4
+            
+            # Combine seating and cargo scores (weight cargo more if it's the top priority)
+            if top_priority == "space":
+                # Top priority: 70% cargo, 30% seating
+                seating_score = cargo_score * 0.7 + seating_score * 0.3
+            else:
+                # Regular priority: 50% cargo, 50% seating
+                seating_score = cargo_score * 0.5 + seating_score * 0.5
         score += weights["seating"] * seating_score
-        reasons.extend(seating_reasons)
         
         # 4. Drivetrain scoring
-        drivetrain_score, drivetrain_reasons = self._score_drivetrain(car, profile)
+        wants_awd = "awd" in features_wanted or terrain == "offroad"
+        has_awd = car.drivetrain_code >= _AWD
+        
+        if wants_awd and has_awd:
+            reasons |= _R.AWD_MATCH
+            drivetrain_score = 1.0
+        elif wants_awd:
+            drivetrain_score = 0.4
+        else:
+            drivetrain_score = 0.8
         score += weights["drivetrain"] * drivetrain_score
-        reasons.extend(drivetrain_reasons)
         
         # 5. Vehicle type scoring
-        type_score, type_reasons = self._score_vehicle_type(car, profile)
+        preferred_vehicle_type = profile.get("vehicle_type", "").lower()  # User's preferred vehicle type
+        
+        if preferred_vehicle_type:
+            # If user specified a preferred vehicle type, STRICTLY prioritize matching it
+            if body_code == self._body_codes.get(preferred_vehicle_type, -1):
+                reasons |= _R.MATCHES_PREFERRED_TYPE
+                type_score = 1.0
+            elif preferred_vehicle_type == "suv" and body_code in (_SUV, _CROSSOVER):
+                reasons |= _R.MATCHES_PREFERRED_SUV
+                type_score = 1.0
+            elif preferred_vehicle_type == "sedan" and body_code in (_SEDAN, _HATCHBACK):
+                reasons |= _R.MATCHES_PREFERRED_SEDAN
+                type_score = 0.9
+            else:
+                # Doesn't match preferred type - zero score so non-matching vehicles never surface
+                type_score = 0.0
+        elif profile.get("needs_ground_clearance", False) or terrain == "rough_city":
+            # Ground clearance needs (potholes, speed bumps, rough roads)
+            # SUVs and trucks typically have better ground clearance
+            if body_code in (_SUV, _TRUCK) or ground_clearance >= 8.0:
+                reasons |= _R.GOOD_CLEARANCE
+                if ground_clearance >= 8.5:
+                    reasons |= _R.EXCELLENT_CLEARANCE
+                type_score = 1.0
+            elif ground_clearance >= 7.0:
+                reasons |= _R.DECENT_CLEARANCE
+                type_score = 0.8
+            elif ground_clearance >= 6.0:
+                type_score = 0.6
+            else:
+                type_score = 0.4
+        elif has_children:
+            if body_code in (_SUV, _MINIVAN) or seats >= 7:
+                reasons |= _R.FAMILY_FRIENDLY
+                type_score = 1.0
+            elif body_code == _SEDAN:
+                type_score = 0.7
+            else:
+                type_score = 0.5
+        elif terrain == "offroad":
+            if car.offroad_capable or body_code == _TRUCK:
+                reasons |= _R.OFFROAD_CAPABLE
+                type_score = 1.0
+            elif ground_clearance >= 8.0:
+                reasons |= _R.GOOD_CLEARANCE
+                type_score = 0.8
+            else:
+                type_score = 0.5
+        elif terrain == "highway":
+            # For highway driving, prioritize fuel efficiency (sedans, hybrids) but also consider comfort (SUVs)
+            if body_code in (_SEDAN, _HATCHBACK):
+                reasons |= _R.EFFICIENT_HIGHWAY_CHOICE
+                type_score = 0.9
+            elif body_code == _SUV:
+                reasons |= _R.COMFORTABLE_HIGHWAY_CHOICE
+                type_score = 0.85
+            else:
+                type_score = 0.7
+        elif body_code in (_SEDAN, _HATCHBACK):
+            reasons |= _R.EFFICIENT_CHOICE
+            type_score = 0.9
+        else:
+            type_score = 0.8
         score += weights["vehicle_type"] * type_score
-        reasons.extend(type_reasons)
         
-        # 6. Performance scoring
-        performance_score, performance_reasons = self._score_performance(car, profile)
+        # 6. Performance scoring (fuel economy as inverse indicator of performance)
+        if "performance" in priorities or "power" in priorities:
+            bucket = bisect_right(_PERFORMANCE_MPG_THRESHOLDS, avg_mpg)
+            reasons |= _PERFORMANCE_REASONS[bucket]
+            performance_score = _PERFORMANCE_SCORES[bucket]
+        else:
+            # Performance not a priority
+            reasons |= _R.ADEQUATE_POWER
+            performance_score = 0.7
         score += weights["performance"] * performance_score
-        reasons.extend(performance_reasons)
         
         # 7. Features scoring
-        features_score, features_reasons = self._score_features(car, profile)
+        feature_matches = []
+        if features_wanted:
+            car_bits = car.feature_bits
+            matches = 0
+            for wanted in features_wanted:
+                wanted_lower = wanted.lower()
+                
+                # Check against driver assist features (known features map to several terms)
+                for term_mask in self._term_masks(wanted_lower):
+                    if car_bits & term_mask == term_mask:
+                        matches += 1
+                        if "carplay" in wanted_lower or "apple" in wanted_lower:
+                            feature_matches.append(_FEATURE_MATCH.HAS_CARPLAY)
+                        elif "cruise" in wanted_lower:
+                            feature_matches.append(_FEATURE_MATCH.HAS_ADAPTIVE_CRUISE)
+                        elif "lane" in wanted_lower:
+                            feature_matches.append(_FEATURE_MATCH.HAS_LANE_ASSIST)
+                        break
+                
+                # Check fuel type for hybrid
+                if "hybrid" in wanted_lower and fuel_code in (_HYBRID, _PLUG_IN_HYBRID):
+                    matches += 1
+                    feature_matches.append(_FEATURE_MATCH.ECO_FRIENDLY)
+                
+                # Check fuel type for electric
+                if "electric" in wanted_lower and fuel_code in (_ELECTRIC, _PLUG_IN_HYBRID):
+                    matches += 1
+                    feature_matches.append(_FEATURE_MATCH.FULLY_ELECTRIC)
+            
+            features_score = matches / len(features_wanted)
+            if features_score >= 0.8:
+                reasons |= _R.FEATURE_RICH
+        else:
+            features_score = 0.7
         score += weights["features"] * features_score
-        reasons.extend(features_reasons)
         
-        # 8. Safety scoring
-        safety_score, safety_reasons = self._score_safety(car, profile)
-        score += weights["safety"] * safety_score
-        reasons.extend(safety_reasons)
+        # 8. Safety scoring (0-1 crash test scale converted to ratings)
+        bucket = bisect_right(_SAFETY_THRESHOLDS, car.safety_score)
+        reasons |= _SAFETY_REASONS[bucket]
         
-        return (score, reasons)
+        # Bonus for comprehensive driver assist
+        if len(car.driver_assist) >= 5:
+            reasons |= _R.ADVANCED_SAFETY_FEATURES
+        score += weights["safety"] * _SAFETY_SCORES[bucket]
+        
+        return (score, reasons, tuple(feature_matches))
+    
+    def _build_record(self, car: Dict[str, Any]) -> CarRecord:
+        """Flatten a catalog car dict into a CarRecord"""
+        body_style = self._get_body_style(car).lower()
+        return CarRecord(
+            id=car["id"],
+            year=car.get("year", 0),
+            price=self._get_price(car),
+            mpg_city=self._get_mpg_city(car),
+            mpg_hwy=self._get_mpg_hwy(car),
+            seats=self._get_seating(car),
+            drivetrain_code=_DRIVETRAIN_CODES.get(self._get_drivetrain(car), -1),
+            body_code=self._body_codes.setdefault(body_style, len(self._body_codes)),
+            fuel_code=_FUEL_CODES.get(self._get_fuel_type(car), -1),
+            child_seat_code=_CHILD_SEAT_CODES.get(self._get_child_seat_fit(car), -1),
+            safety_score=self._get_safety_score(car),
+            driver_assist=tuple(self._get_driver_assist_features(car)),
+            offroad_capable=self._is_offroad_capable(car),
+            ground_clearance=self._get_ground_clearance(car),
+            cargo_volume_cuft=self._get_cargo_volume_cuft(car),
+            feature_bits=self._pack_tokens(self._tokenize_driver_assist(car)),
+        )
     
     # Helper methods to extract data from new format
     def _get_price(self, car: Dict[str, Any]) -> float:
@@ -203,6 +731,33 @@ class CatalogScoringService:
         """Extract driver assist features"""
         return car.get("specs", {}).get("safety", {}).get("driver_assist", [])
     
+    def _tokenize_driver_assist(self, car: Dict[str, Any]) -> frozenset:
+        """Split driver assist features into lowercase word tokens"""
+        return frozenset(
+            token
+            for feature in self._get_driver_assist_features(car)
+            for token in feature.lower().replace("_", " ").split()
+        )
+    
+    def _pack_tokens(self, tokens) -> int:
+        """Pack feature tokens into a bitmask (tokens outside the catalog vocabulary are dropped)"""
+        bits = 0
+        for token in tokens:
+            bits |= self._token_bits.get(token, 0)
+        return bits
+    
+    def _build_term_masks(self, wanted: str) -> tuple[int, ...]:
+        """
+        Bitmasks for the search terms of a wanted feature
+        
+        Terms using a word that no car has can never match, so they are left out.
+        """
+        masks = []
+        for term in self.FEATURE_SEARCH_TERMS.get(wanted) or (tuple(wanted.split()),):
+            if all(token in self._token_bits for token in term):
+                masks.append(self._pack_tokens(term))
+        return tuple(masks)
+    
     def _is_offroad_capable(self, car: Dict[str, Any]) -> bool:
         """Check if car is offroad capable"""
         return car.get("specs", {}).get("environment_fit", {}).get("offroad_capable", False)
@@ -235,335 +790,26 @@ class CatalogScoringService:
                 return float(match.group(1))
         
         return 15.0  # Default
-    
-    # Scoring methods
-    def _score_budget(self, car: Dict[str, Any], profile: Dict[str, Any]) -> tuple[float, List[str]]:
-        """Score based on budget"""
-        reasons = []
-        budget_max = profile.get("budget_max", 50000)
-        budget_is_total_cost = profile.get("budget_is_total_cost", False)
-        budget_flexible = profile.get("budget_flexible", False)
-        price = self._get_price(car)
-        
-        # If budget is total cost and flexible, be more lenient
-        if budget_is_total_cost and budget_flexible:
-            # For flexible total cost budgets, allow up to 15% over (since base price + taxes/fees = total)
-            effective_budget = budget_max * 1.15
-        elif budget_is_total_cost:
-            # For strict total cost budgets, estimate base price (budget_max already accounts for taxes)
-            # The scoring profile should have budget_max_estimated_base, but if not, use 88% of total
-            effective_budget = profile.get("budget_max_estimated_base", int(budget_max * 0.88))
-        elif budget_flexible:
-            # Flexible base price budget - allow 10% over
-            effective_budget = budget_max * 1.10
-        else:
-            # Strict base price budget
-            effective_budget = budget_max
-        
-        if price <= effective_budget:
-            ratio = 1.0 - (price / effective_budget) * 0.3
-            reasons.append("within_budget")
-            if price <= effective_budget * 0.8:
-                reasons.append("under_budget")
-            if budget_flexible:
-                reasons.append("budget_flexible")
-            return (ratio, reasons)
-        else:
-            # If budget is flexible, still give some score even if over
-            if budget_flexible and price <= effective_budget * 1.2:
-                return (0.5, ["over_budget_but_flexible"])
-            return (0.2, [])
-    
-    def _score_fuel_efficiency(self, car: Dict[str, Any], profile: Dict[str, Any]) -> tuple[float, List[str]]:
-        """Score based on fuel efficiency"""
-        reasons = []
-        mpg_city = self._get_mpg_city(car)
-        mpg_hwy = self._get_mpg_hwy(car)
-        avg_mpg = (mpg_city + mpg_hwy) / 2
-        commute = profile.get("commute_miles", 0)
-        
-        # Check if hybrid/electric
-        fuel_type = self._get_fuel_type(car)
-        if fuel_type in ["hybrid", "electric", "plug_in_hybrid"]:
-            reasons.append("eco_friendly")
-        
-        if commute > 30:
-            if avg_mpg >= 40:
-                reasons.append("excellent_mpg")
-                return (1.0, reasons)
-            elif avg_mpg >= 30:
-                reasons.append("good_mpg")
-                return (0.8, reasons)
-            elif avg_mpg >= 25:
-                reasons.append("decent_mpg")
-                return (0.6, reasons)
-            else:
-                return (0.3, reasons)
-        else:
-            if avg_mpg >= 30:
-                reasons.append("good_mpg")
-            return (0.7, reasons)
-    
-    def _score_seating(self, car: Dict[str, Any], profile: Dict[str, Any]) -> tuple[float, List[str]]:
-        """Score based on seating capacity and cargo space"""
-        reasons = []
-        passengers_needed = profile.get("passengers", 5)
-        seats = self._get_seating(car)
-        priorities = profile.get("priorities", [])
-        top_priority = profile.get("top_priority")
-        
-        # Check seating capacity
-        seating_score = 1.0
-        if seats >= passengers_needed:
-            reasons.append("enough_seats")
-            if seats >= passengers_needed + 2:
-                reasons.append("extra_space")
-            
-            # Bonus for good child seat fit if has children
-            if profile.get("has_children") and self._get_child_seat_fit(car) in ["good", "excellent"]:
-                reasons.append("child_seat_friendly")
-        else:
-            seating_score = 0.2
-        
-        # Score cargo/trunk space (especially important if space is a priority)
-        cargo_volume_cuft = self._get_cargo_volume_cuft(car)
-        space_is_priority = "space" in priorities or top_priority == "space"
-        
-        if space_is_priority:
-            # If space is a priority, heavily weight cargo volume
-            # Large cargo: >20 cu ft = excellent, 15-20 = good, 10-15 = decent, <10 = poor
-            if cargo_volume_cuft >= 20:
-                reasons.append("excellent_cargo_space")
-                cargo_score = 1.0
-            elif cargo_volume_cuft >= 15:
-                reasons.append("good_cargo_space")
-                cargo_score = 0.9
-            elif cargo_volume_cuft >= 12:
-                reasons.append("decent_cargo_space")
-                cargo_score = 0.7
-            else:
-                cargo_score = 0.4
-            
-            # Combine seating and cargo scores (weight cargo more if it's the top priority)
-            if top_priority == "space":
-                # Top priority: 70% cargo, 30% seating
-                combined_score = cargo_score * 0.7 + seating_score * 0.3
-            else:
-                # Regular priority: 50% cargo, 50% seating
-                combined_score = cargo_score * 0.5 + seating_score * 0.5
-            
-            return (combined_score, reasons)
-        else:
-            # Space not a priority, just return seating score
-            return (seating_score, reasons)
-    
-    def _score_drivetrain(self, car: Dict[str, Any], profile: Dict[str, Any]) -> tuple[float, List[str]]:
-        """Score based on drivetrain"""
-        reasons = []
-        features_wanted = profile.get("features_wanted", [])
-        terrain = profile.get("terrain", "mixed")
-        drivetrain = self._get_drivetrain(car)
-        
-        wants_awd = "awd" in features_wanted or terrain == "offroad"
-        has_awd = drivetrain in ["AWD", "4WD"]
-        
-        if wants_awd and has_awd:
-            reasons.append("awd_match")
-            return (1.0, reasons)
-        elif wants_awd and not has_awd:
-            return (0.4, reasons)
-        else:
-            return (0.8, reasons)
-    
-    def _score_vehicle_type(self, car: Dict[str, Any], profile: Dict[str, Any]) -> tuple[float, List[str]]:
-        """Score based on vehicle type"""
-        reasons = []
-        has_children = profile.get("has_children", False)
-        terrain = profile.get("terrain", "mixed")
-        needs_ground_clearance = profile.get("needs_ground_clearance", False)
-        preferred_vehicle_type = profile.get("vehicle_type", "").lower()  # User's preferred vehicle type
-        body_style = self._get_body_style(car).lower()
-        seats = self._get_seating(car)
-        ground_clearance = self._get_ground_clearance(car)
-        
-        # If user specified a preferred vehicle type, STRICTLY prioritize matching it
-        # This is critical - if user wants SUV, we should NOT show sedans
-        if preferred_vehicle_type:
-            if body_style == preferred_vehicle_type:
-                reasons.append(f"matches_preferred_{preferred_vehicle_type}")
-                return (1.0, reasons)
-            elif preferred_vehicle_type == "suv" and body_style in ["suv", "crossover"]:
-                reasons.append("matches_preferred_suv")
-                return (1.0, reasons)
-            elif preferred_vehicle_type == "sedan" and body_style in ["sedan", "hatchback"]:
-                reasons.append("matches_preferred_sedan")
-                return (0.9, reasons)
-            else:
-                # Doesn't match preferred type - VERY LOW score to ensure non-matching vehicles are filtered out
-                # Return 0.0 or very low score so they don't appear in recommendations
-                return (0.0, reasons)  # Changed from 0.3 to 0.0 to completely filter out non-matching types
-        
-        # Handle ground clearance needs (potholes, speed bumps, rough roads)
-        if needs_ground_clearance or terrain == "rough_city":
-            # SUVs and trucks typically have better ground clearance
-            if body_style in ["suv", "truck"] or ground_clearance >= 8.0:
-                reasons.append("good_clearance")
-                if ground_clearance >= 8.5:
-                    reasons.append("excellent_clearance")
-                return (1.0, reasons)
-            elif ground_clearance >= 7.0:
-                reasons.append("decent_clearance")
-                return (0.8, reasons)
-            elif ground_clearance >= 6.0:
-                return (0.6, reasons)
-            else:
-                return (0.4, reasons)
-        
-        if has_children:
-            if body_style in ["suv", "minivan"] or seats >= 7:
-                reasons.append("family_friendly")
-                return (1.0, reasons)
-            elif body_style == "sedan":
-                return (0.7, reasons)
-            else:
-                return (0.5, reasons)
-        else:
-            if terrain == "offroad":
-                if self._is_offroad_capable(car) or body_style == "truck":
-                    reasons.append("offroad_capable")
-                    return (1.0, reasons)
-                elif ground_clearance >= 8.0:
-                    reasons.append("good_clearance")
-                    return (0.8, reasons)
-                else:
-                    return (0.5, reasons)
-            elif terrain == "highway":
-                # For highway driving, prioritize fuel efficiency (sedans, hybrids) but also consider comfort (SUVs)
-                if body_style in ["sedan", "hatchback"]:
-                    reasons.append("efficient_highway_choice")
-                    return (0.9, reasons)
-                elif body_style in ["suv"]:
-                    reasons.append("comfortable_highway_choice")
-                    return (0.85, reasons)
-                else:
-                    return (0.7, reasons)
-            elif body_style in ["sedan", "hatchback"]:
-                reasons.append("efficient_choice")
-                return (0.9, reasons)
-            else:
-                return (0.8, reasons)
-    
-    def _score_performance(self, car: Dict[str, Any], profile: Dict[str, Any]) -> tuple[float, List[str]]:
-        """Score based on performance (using eco_score inversely for performance)"""
-        reasons = []
-        priorities = profile.get("priorities", [])
-        
-        cares_about_performance = "performance" in priorities or "power" in priorities
-        
-        # Use fuel economy as inverse indicator of performance
-        # Low MPG often means more powerful engine
-        avg_mpg = (self._get_mpg_city(car) + self._get_mpg_hwy(car)) / 2
-        
-        if cares_about_performance:
-            if avg_mpg < 25:  # Lower MPG = more powerful
-                reasons.append("high_performance")
-                return (1.0, reasons)
-            elif avg_mpg < 30:
-                reasons.append("good_power")
-                return (0.8, reasons)
-            else:
-                return (0.6, reasons)
-        else:
-            # Performance not a priority
-            reasons.append("adequate_power")
-            return (0.7, reasons)
-    
-    def _score_features(self, car: Dict[str, Any], profile: Dict[str, Any]) -> tuple[float, List[str]]:
-        """Score based on features"""
-        reasons = []
-        features_wanted = profile.get("features_wanted", [])
-        
-        if not features_wanted:
-            return (0.7, reasons)
-        
-        driver_assist = self._get_driver_assist_features(car)
-        driver_assist_lower = [f.lower().replace("_", " ") for f in driver_assist]
-        
-        # Feature matching
-        feature_map = {
-            "apple_carplay": ["apple", "carplay"],
-            "android_auto": ["android", "auto"],
-            "leather_seats": ["leather"],
-            "panoramic_sunroof": ["panoramic", "sunroof"],
-            "sunroof": ["sunroof"],
-            "blind_spot_monitor": ["blind spot", "blind_spot"],
-            "adaptive_cruise": ["adaptive cruise", "adaptive_cruise_control"],
-            "lane_departure": ["lane", "lane_keep"],
-            "3_row_seating": ["3_row", "three_row"],
-            "hybrid": ["hybrid"],
-        }
-        
-        matches = 0
-        for wanted in features_wanted:
-            wanted_lower = wanted.lower()
-            
-            # Check if it's a known feature
-            search_terms = feature_map.get(wanted_lower, [wanted_lower])
-            
-            # Check against driver assist features
-            for term in search_terms:
-                if any(term in feature for feature in driver_assist_lower):
-                    matches += 1
-                    if "carplay" in wanted_lower or "apple" in wanted_lower:
-                        reasons.append("has_carplay")
-                    elif "cruise" in wanted_lower:
-                        reasons.append("has_adaptive_cruise")
-                    elif "lane" in wanted_lower:
-                        reasons.append("has_lane_assist")
-                    break
-            
-            # Check fuel type for hybrid
-            if "hybrid" in wanted_lower and self._get_fuel_type(car) in ["hybrid", "plug_in_hybrid"]:
-                matches += 1
-                reasons.append("eco_friendly")
-            
-            # Check fuel type for electric
-            if "electric" in wanted_lower and self._get_fuel_type(car) in ["electric", "plug_in_hybrid"]:
-                matches += 1
-                reasons.append("fully_electric")
-        
-        if len(features_wanted) > 0:
-            match_ratio = matches / len(features_wanted)
-            if match_ratio >= 0.8:
-                reasons.append("feature_rich")
-            return (match_ratio, reasons)
-        
-        return (0.7, reasons)
-    
-    def _score_safety(self, car: Dict[str, Any], profile: Dict[str, Any]) -> tuple[float, List[str]]:
-        """Score based on safety"""
-        reasons = []
-        safety_score = self._get_safety_score(car)  # 0-1 scale
-        driver_assist = self._get_driver_assist_features(car)
-        
-        # Convert 0-1 scale to ratings
-        if safety_score >= 0.9:
-            reasons.append("top_safety")
-            score = 1.0
-        elif safety_score >= 0.8:
-            reasons.append("excellent_safety")
-            score = 0.9
-        elif safety_score >= 0.7:
-            score = 0.7
-        else:
-            score = 0.5
-        
-        # Bonus for comprehensive driver assist
-        if len(driver_assist) >= 5:
-            reasons.append("advanced_safety_features")
-        
-        return (score, reasons)
 
 
-# Singleton instance
-catalog_scoring_service = CatalogScoringService()
+# Singleton instance (created on first use so importing this module does no I/O).
+# Tools run on worker threads, so construction is locked to load the catalog once.
+_catalog_scoring_service: Optional[CatalogScoringService] = None
+_catalog_scoring_service_lock = threading.Lock()
+
+
+def get_catalog_scoring_service() -> CatalogScoringService:
+    """Get the shared CatalogScoringService, loading the catalog on first call"""
+    global _catalog_scoring_service
+    if _catalog_scoring_service is None:
+        with _catalog_scoring_service_lock:
+            if _catalog_scoring_service is None:
+                _catalog_scoring_service = CatalogScoringService()
+    return _catalog_scoring_service
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve the legacy `catalog_scoring_service` attribute lazily (PEP 562)"""
+    if name == "catalog_scoring_service":
+        return get_catalog_scoring_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
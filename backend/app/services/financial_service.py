@@ -7,22 +7,66 @@ Calculates monthly payments, total cost of ownership, and affordability scores.
 This ensures recommendations are not just about preferences, but also financial reality.
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
+from bisect import bisect_right
 from dataclasses import dataclass
-import math
+from functools import lru_cache
 
 
-@dataclass
+# Affordability reason tags
+_REASON_EXCELLENT_PAYMENT_RATIO = "excellent_payment_ratio"
+_REASON_ACCEPTABLE_PAYMENT_RATIO = "acceptable_payment_ratio"
+_REASON_STRONG_DOWN_PAYMENT = "strong_down_payment"
+_REASON_ADEQUATE_DOWN_PAYMENT = "adequate_down_payment"
+_REASON_PAYMENT_TOO_HIGH = "payment_too_high_for_income"
+_REASON_INSUFFICIENT_DOWN_PAYMENT = "insufficient_down_payment"
+_REASON_NO_PRICE_DATA = "no_price_data"
+
+# Warning messages
+_WARN_DTI_HIGH = "Payment is higher than recommended 10% of income"
+_WARN_DTI_OVER = "Payment exceeds 15% of income - financial strain likely"
+_WARN_DP_LOW = "Less than 20% down - may be underwater on loan"
+_WARN_CS_LOW_INT = "Credit score may result in high interest rates"
+_WARN_CS_LOW_STR = "Credit rating may result in high interest rates"
+_WARN_LONG_TERM = "Loan term over 5 years - will pay more interest"
+
+
+@lru_cache(maxsize=None)
+def _message_tuple(*messages: Optional[str]) -> Tuple[str, ...]:
+    """
+    Tuple of the given reasons/warnings, skipping None
+    
+    There are only a few dozen possible combinations, so each one is built
+    once and shared by every result that has it.
+    """
+    return tuple(message for message in messages if message is not None)
+
+
+@dataclass(slots=True, frozen=True)
 class AffordabilityResult:
-    """Result of affordability calculation"""
+    """Result of affordability calculation (immutable - results are cached and shared)"""
     affordable: bool
     affordability_score: float  # 0-1, where 1 is most affordable
     monthly_payment: float
     down_payment_required: float
     total_cost_5yr: float
     debt_to_income_ratio: float
-    reasons: List[str]
-    warnings: List[str]
+    reasons: Tuple[str, ...]
+    warnings: Tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class _LoanTerms:
+    """Profile-level inputs shared by every car evaluated against one financial profile"""
+    monthly_income: float
+    down_payment: float
+    trade_in_value: float
+    credit_score: Any
+    loan_term_months: int
+    interest_rate: float
+    # Amortization terms r(1+r)^n and (1+r)^n - 1 (unused when the rate is 0)
+    payment_numerator: float
+    payment_denominator: float
 
 
 class FinancialService:
@@ -33,6 +77,7 @@ class FinancialService:
     RECOMMENDED_DTI_RATIO = 0.10  # Recommended is 10%
     MIN_DOWN_PAYMENT_PERCENT = 0.10  # Minimum 10% down
     RECOMMENDED_DOWN_PAYMENT_PERCENT = 0.20  # 20% recommended to avoid underwater loan
+    DTI_SCORE_SPAN = MAX_DTI_RATIO - RECOMMENDED_DTI_RATIO  # Range where the DTI score tapers off
     
     # Interest rates by credit score (approximate 2024 rates)
     INTEREST_RATES = {
@@ -43,8 +88,21 @@ class FinancialService:
         'very_poor': 0.1599,  # <600
     }
     
+    # Numeric credit scores: bisect_right(thresholds, score) indexes the rate
+    CREDIT_SCORE_THRESHOLDS = (600, 650, 700, 750)
+    RATES_BY_CREDIT_BUCKET = (
+        INTEREST_RATES['very_poor'],
+        INTEREST_RATES['poor'],
+        INTEREST_RATES['fair'],
+        INTEREST_RATES['good'],
+        INTEREST_RATES['excellent'],
+    )
+    
     def __init__(self):
-        pass
+        # A car's result depends only on its price, its operating costs and the
+        # resolved loan terms, so repeat evaluations (the agent re-checks the
+        # same cars every turn) are memoized per instance
+        self._evaluate_cached = lru_cache(maxsize=4096)(self._evaluate_costs)
     
     def evaluate_affordability(
         self, 
@@ -61,30 +119,110 @@ class FinancialService:
         Returns:
             AffordabilityResult with detailed affordability analysis
         """
-        # Extract car pricing
-        car_price = self._get_car_price(car)
+        return self._evaluate(car, self._resolve_loan_terms(financial_profile))
+    
+    def evaluate_affordability_batch(
+        self,
+        cars: List[Dict[str, Any]],
+        financial_profile: Dict[str, Any]
+    ) -> List[AffordabilityResult]:
+        """
+        Evaluate affordability of many cars for the same user
+        
+        The financial profile (income, interest rate, amortization terms) is
+        resolved once and shared by every car instead of once per car.
         
+        Args:
+            cars: Vehicles from catalog
+            financial_profile: User's financial information
+        
+        Returns:
+            One AffordabilityResult per car, in the same order as cars
+        """
+        terms = self._resolve_loan_terms(financial_profile)
+        return [self._evaluate(car, terms) for car in cars]
+    
+    def _resolve_loan_terms(self, financial_profile: Dict[str, Any]) -> _LoanTerms:
+        """Extract the car-independent part of an affordability evaluation"""
         # Extract user financial info
         monthly_income = financial_profile.get('monthly_income', 0)
         annual_income = financial_profile.get('annual_income', 0)
         if annual_income and not monthly_income:
             monthly_income = annual_income / 12
         
-        down_payment = financial_profile.get('down_payment', 0)
         credit_score = financial_profile.get('credit_score', 'good')
         loan_term_months = financial_profile.get('loan_term_months', 60)  # Default 5 years
-        trade_in_value = financial_profile.get('trade_in_value', 0)
         
         # Get interest rate based on credit score
         interest_rate = self._get_interest_rate(credit_score)
         
+        # Amortization formula: P * [r(1+r)^n] / [(1+r)^n - 1] - only P varies by car
+        numerator = denominator = 0.0
+        if interest_rate != 0:
+            monthly_rate = interest_rate / 12
+            growth = (1 + monthly_rate) ** loan_term_months
+            numerator = monthly_rate * growth
+            denominator = growth - 1
+        
+        return _LoanTerms(
+            monthly_income=monthly_income,
+            down_payment=financial_profile.get('down_payment', 0),
+            trade_in_value=financial_profile.get('trade_in_value', 0),
+            credit_score=credit_score,
+            loan_term_months=loan_term_months,
+            interest_rate=interest_rate,
+            payment_numerator=numerator,
+            payment_denominator=denominator
+        )
+    
+    def _evaluate(self, car: Dict[str, Any], terms: _LoanTerms) -> AffordabilityResult:
+        """
+        Evaluate one car against already-resolved loan terms
+        
+        Results are cached and shared between calls - treat them as read-only.
+        """
+        # Extract car pricing and running costs
+        car_price = self._get_car_price(car)
+        if car_price <= 0:
+            # No price data - nothing meaningful to finance, reject without the full evaluation
+            return AffordabilityResult(
+                affordable=False,
+                affordability_score=0.0,
+                monthly_payment=0.0,
+                down_payment_required=0.0,
+                total_cost_5yr=0.0,
+                debt_to_income_ratio=1.0,
+                reasons=_message_tuple(_REASON_NO_PRICE_DATA),
+                warnings=_message_tuple()
+            )
+        
+        annual_operating_cost = self._get_annual_operating_cost(car)
+        
+        try:
+            return self._evaluate_cached(car_price, annual_operating_cost, terms)
+        except TypeError:
+            # Unhashable profile value (e.g. a list credit_score) - skip the cache
+            return self._evaluate_costs(car_price, annual_operating_cost, terms)
+    
+    def _evaluate_costs(
+        self,
+        car_price: float,
+        annual_operating_cost: float,
+        terms: _LoanTerms
+    ) -> AffordabilityResult:
+        """Evaluate a car, given its price and annual operating cost, against loan terms"""
+        monthly_income = terms.monthly_income
+        credit_score = terms.credit_score
+        loan_term_months = terms.loan_term_months
+        
         # Calculate down payment
+        down_payment = terms.down_payment
         if down_payment == 0:
             # Auto-calculate minimum down payment
             down_payment = car_price * self.MIN_DOWN_PAYMENT_PERCENT
         
         # Add trade-in to down payment
-        effective_down_payment = down_payment + trade_in_value
+        effective_down_payment = down_payment + terms.trade_in_value
         
         # Calculate loan amount
         loan_amount = car_price - effective_down_payment
@@ -93,15 +231,16 @@ class FinancialService:
             loan_amount = 0
         
         # Calculate monthly payment
-        monthly_payment = self._calculate_monthly_payment(
-            loan_amount, 
-            interest_rate, 
-            loan_term_months
-        )
+        if loan_amount <= 0:
+            monthly_payment = 0
+        elif terms.interest_rate == 0:
+            monthly_payment = loan_amount / loan_term_months
+        else:
+            monthly_payment = loan_amount * terms.payment_numerator / terms.payment_denominator
         
         # Calculate total 5-year cost of ownership
         total_cost_5yr = self._calculate_total_cost_ownership(
-            car, 
+            annual_operating_cost, 
             car_price, 
             monthly_payment, 
             loan_term_months
@@ -159,51 +298,25 @@ class FinancialService:
         """Extract car price from nested structure"""
         return car.get('specs', {}).get('pricing', {}).get('base_msrp', 0)
     
+    def _get_annual_operating_cost(self, car: Dict[str, Any]) -> float:
+        """Extract yearly fuel + insurance + maintenance cost from car data"""
+        annual_fuel = car.get('annual_fuel_cost', 1200)
+        annual_insurance = car.get('annual_insurance', 1200)
+        annual_maintenance = car.get('annual_maintenance', 800)
+        return annual_fuel + annual_insurance + annual_maintenance
+    
     def _get_interest_rate(self, credit_score: Any) -> float:
         """Get interest rate based on credit score"""
         if isinstance(credit_score, int):
-            if credit_score >= 750:
-                return self.INTEREST_RATES['excellent']
-            elif credit_score >= 700:
-                return self.INTEREST_RATES['good']
-            elif credit_score >= 650:
-                return self.INTEREST_RATES['fair']
-            elif credit_score >= 600:
-                return self.INTEREST_RATES['poor']
-            else:
-                return self.INTEREST_RATES['very_poor']
+            return self.RATES_BY_CREDIT_BUCKET[bisect_right(self.CREDIT_SCORE_THRESHOLDS, credit_score)]
         elif isinstance(credit_score, str):
             return self.INTEREST_RATES.get(credit_score.lower(), self.INTEREST_RATES['good'])
         else:
             return self.INTEREST_RATES['good']
     
-    def _calculate_monthly_payment(
-        self, 
-        loan_amount: float, 
-        annual_interest_rate: float, 
-        loan_term_months: int
-    ) -> float:
-        """Calculate monthly loan payment using amortization formula"""
-        if loan_amount <= 0:
-            return 0
-        
-        if annual_interest_rate == 0:
-            return loan_amount / loan_term_months
-        
-        monthly_rate = annual_interest_rate / 12
-        
-        # Amortization formula: P * [r(1+r)^n] / [(1+r)^n - 1]
-        payment = loan_amount * (
-            monthly_rate * math.pow(1 + monthly_rate, loan_term_months)
-        ) / (
-            math.pow(1 + monthly_rate, loan_term_months) - 1
-        )
-        
-        return payment
-    
     def _calculate_total_cost_ownership(
         self,
-        car: Dict[str, Any],
+        annual_operating_cost: float,
         car_price: float,
         monthly_payment: float,
         loan_term_months: int
@@ -213,13 +326,8 @@ class FinancialService:
         months_in_5yr = min(loan_term_months, 60)
         purchase_cost = monthly_payment * months_in_5yr
         
-        # Extract operating costs from car data
-        annual_fuel = car.get('annual_fuel_cost', 1200)
-        annual_insurance = car.get('annual_insurance', 1200)
-        annual_maintenance = car.get('annual_maintenance', 800)
-        
         # 5-year operating costs
-        operating_costs_5yr = (annual_fuel + annual_insurance + annual_maintenance) * 5
+        operating_costs_5yr = annual_operating_cost * 5
         
         # Depreciation (cars typically lose 60% value in 5 years)
         depreciation = car_price * 0.60
@@ -265,16 +373,16 @@ class FinancialService:
         if monthly_income == 0:
             return 0.0
         
-        # Score based on DTI ratio (lower is better)
-        if dti_ratio <= self.RECOMMENDED_DTI_RATIO:
-            dti_score = 1.0
-        elif dti_ratio <= self.MAX_DTI_RATIO:
-            # Linear scale between recommended and max
-            dti_score = 1.0 - ((dti_ratio - self.RECOMMENDED_DTI_RATIO) / 
-                              (self.MAX_DTI_RATIO - self.RECOMMENDED_DTI_RATIO)) * 0.4
-        else:
-            # Penalty for exceeding max DTI
-            dti_score = max(0, 0.6 - (dti_ratio - self.MAX_DTI_RATIO) * 2)
+        # Score based on DTI ratio (lower is better), as one saturating expression:
+        # 1.0 up to the recommended ratio, a linear drop to 0.6 at the max ratio,
+        # then a penalty of 2x the excess over max, floored at 0
+        span = self.DTI_SCORE_SPAN
+        dti_score = max(
+            0.0,
+            1.0
+            - min(max(0.0, dti_ratio - self.RECOMMENDED_DTI_RATIO), span) / span * 0.4
+            - max(0.0, dti_ratio - self.MAX_DTI_RATIO) * 2
+        )
         
         # Score based on down payment percentage (higher is better)
         down_payment_ratio = down_payment / car_price if car_price > 0 else 0
@@ -295,30 +403,29 @@ class FinancialService:
         down_payment: float,
         car_price: float,
         monthly_income: float
-    ) -> List[str]:
+    ) -> Tuple[str, ...]:
         """Generate human-readable reasons for affordability assessment"""
-        reasons = []
+        dti_reason = down_payment_reason = None
+        down_payment_ratio = down_payment / car_price if car_price > 0 else 0
         
         if affordable:
             if dti_ratio <= self.RECOMMENDED_DTI_RATIO:
-                reasons.append("excellent_payment_ratio")
+                dti_reason = _REASON_EXCELLENT_PAYMENT_RATIO
             elif dti_ratio <= self.MAX_DTI_RATIO:
-                reasons.append("acceptable_payment_ratio")
+                dti_reason = _REASON_ACCEPTABLE_PAYMENT_RATIO
             
-            down_payment_ratio = down_payment / car_price if car_price > 0 else 0
             if down_payment_ratio >= self.RECOMMENDED_DOWN_PAYMENT_PERCENT:
-                reasons.append("strong_down_payment")
+                down_payment_reason = _REASON_STRONG_DOWN_PAYMENT
             elif down_payment_ratio >= self.MIN_DOWN_PAYMENT_PERCENT:
-                reasons.append("adequate_down_payment")
+                down_payment_reason = _REASON_ADEQUATE_DOWN_PAYMENT
         else:
             if dti_ratio > self.MAX_DTI_RATIO:
-                reasons.append("payment_too_high_for_income")
+                dti_reason = _REASON_PAYMENT_TOO_HIGH
             
-            down_payment_ratio = down_payment / car_price if car_price > 0 else 0
             if down_payment_ratio < self.MIN_DOWN_PAYMENT_PERCENT:
-                reasons.append("insufficient_down_payment")
+                down_payment_reason = _REASON_INSUFFICIENT_DOWN_PAYMENT
         
-        return reasons
+        return _message_tuple(dti_reason, down_payment_reason)
     
     def _generate_warnings(
         self,
@@ -327,32 +434,32 @@ class FinancialService:
         car_price: float,
         credit_score: Any,
         loan_term_months: int
-    ) -> List[str]:
+    ) -> Tuple[str, ...]:
         """Generate warnings about potential financial issues"""
-        warnings = []
+        dti_warning = down_payment_warning = credit_warning = term_warning = None
         
         # DTI warnings
         if dti_ratio > self.RECOMMENDED_DTI_RATIO and dti_ratio <= self.MAX_DTI_RATIO:
-            warnings.append("Payment is higher than recommended 10% of income")
+            dti_warning = _WARN_DTI_HIGH
         elif dti_ratio > self.MAX_DTI_RATIO:
-            warnings.append("Payment exceeds 15% of income - financial strain likely")
+            dti_warning = _WARN_DTI_OVER
         
         # Down payment warnings
         down_payment_ratio = down_payment / car_price if car_price > 0 else 0
         if down_payment_ratio < self.RECOMMENDED_DOWN_PAYMENT_PERCENT:
-            warnings.append("Less than 20% down - may be underwater on loan")
+            down_payment_warning = _WARN_DP_LOW
         
         # Credit score warnings
         if isinstance(credit_score, int) and credit_score < 650:
-            warnings.append("Credit score may result in high interest rates")
+            credit_warning = _WARN_CS_LOW_INT
         elif isinstance(credit_score, str) and credit_score.lower() in ['fair', 'poor', 'very_poor']:
-            warnings.append("Credit rating may result in high interest rates")
+            credit_warning = _WARN_CS_LOW_STR
         
         # Loan term warnings
         if loan_term_months > 60:
-            warnings.append("Loan term over 5 years - will pay more interest")
+            term_warning = _WARN_LONG_TERM
         
-        return warnings
+        return _message_tuple(dti_warning, down_payment_warning, credit_warning, term_warning)
     
     def format_affordability_summary(self, result: AffordabilityResult) -> str:
         """Format affordability result for display"""
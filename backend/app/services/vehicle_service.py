@@ -1,8 +1,37 @@
-import json
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from functools import lru_cache
+from operator import eq, ge, le
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+import sys
+import threading
+from typing import List, Dict, Any, Callable, Optional
+import orjson
 from app.models.chat import Vehicle
 
+
+_COMPARISON_OPERATORS = {eq: "==", le: "<=", ge: ">="}
+
+
+@lru_cache(maxsize=None)
+def _compile_row_filter(tests: tuple) -> Callable:
+    """
+    Build a single-pass filter for one sequence of column tests
+    
+    The result is called as row_filter(rows, column0, target0, column1, target1, ...)
+    and returns the rows where every column[row] <test> target holds, checked in
+    the given order with short-circuiting. There are only a handful of distinct
+    test sequences, so each is generated once and reused.
+    """
+    params = ", ".join(f"column{n}, target{n}" for n in range(len(tests)))
+    condition = " and ".join(
+        f"column{n}[i] {_COMPARISON_OPERATORS[test]} target{n}" for n, test in enumerate(tests)
+    )
+    namespace: Dict[str, Any] = {}
+    exec(f"def row_filter(rows, {params}):\n    return [i for i in rows if {condition}]\n", namespace)
+    return namespace["row_filter"]
+
+
 class VehicleService:
     """Service for loading and filtering vehicle data from JSON"""
 
@@ -10,23 +39,81 @@ class VehicleService:
         # Load cars.json on initialization
         self.cars_data = self._load_cars_data()
 
+        # Column views of the fields find_vehicles filters on (one tuple per
+        # field, indexed by row) so filters compare plain values instead of
+        # walking each car's nested dicts. Text columns are stored lowercased
+        # since every text filter is case-insensitive, and interned (as are the
+        # filter values) so equal strings are one object and compare by identity.
+        specs = [car.get("specs", {}) for car in self.cars_data]
+        self._model_lc = tuple(sys.intern(car.get("model", "").lower()) for car in self.cars_data)
+        self._body_lc = tuple(sys.intern(spec.get("body_style", "").lower()) for spec in specs)
+        self._fuel_lc = tuple(sys.intern(spec.get("powertrain", {}).get("fuel_type", "").lower()) for spec in specs)
+        self._condition_lc = tuple(sys.intern(car.get("condition", "").strip().lower()) for car in self.cars_data)
+        self._price = tuple(spec.get("pricing", {}).get("base_msrp", float('inf')) for spec in specs)
+        self._mpg_hwy = tuple(spec.get("powertrain", {}).get("mpg_hwy", 0) for spec in specs)
+        self._seats = tuple(spec.get("capacity", {}).get("seats", 0) for spec in specs)
+        self._year = tuple(car.get("year") for car in self.cars_data)
+
+        # Inverted indexes (value -> matching rows, in catalog order) for the
+        # equality filters, plus sorted copies of the range columns. Together
+        # they give the exact number of rows each filter keeps on its own, so
+        # find_vehicles can start from the narrowest one.
+        self._model_rows = self._build_row_index(self._model_lc)
+        self._body_rows = self._build_row_index(self._body_lc)
+        self._fuel_rows = self._build_row_index(self._fuel_lc)
+        self._condition_rows = self._build_row_index(self._condition_lc)
+        self._year_rows = self._build_row_index(self._year)
+        self._sorted_price = sorted(self._price)
+        self._sorted_mpg_hwy = sorted(self._mpg_hwy)
+        self._sorted_seats = sorted(self._seats)
+
+        # Row lookup by vehicle id (the first car wins if an id is repeated)
+        self._row_by_id: Dict[str, int] = {}
+        for i, car in enumerate(self.cars_data):
+            self._row_by_id.setdefault(car.get("id"), i)
+
+        # The catalog never changes after load, so each car is validated into a
+        # Vehicle once (on first request) and the stats are computed once; every
+        # lookup afterwards hands out those shared instances
+        self._vehicles: Optional[List[Vehicle]] = None
+        self._cost_rows: Optional[List[tuple]] = None
+        self._catalog_stats: Optional[Dict[str, Any]] = None
+
+        # The agent repeats the same searches across a conversation, so the
+        # matching rows for each normalized filter set are memoized per instance
+        self._find_rows_cached = lru_cache(maxsize=256)(self._find_rows)
+
+        # Same for cost breakdowns: the agent prices the same cars for the same
+        # commute over and over
+        self._true_cost_cached = lru_cache(maxsize=1024)(self._calculate_true_cost)
+
     def _load_cars_data(self) -> List[Dict[str, Any]]:
         """Load vehicle data from cars.json"""
         cars_file = Path(__file__).parent.parent / "data" / "cars.json"
 
         try:
-            with open(cars_file, 'r') as f:
-                data = json.load(f, object_hook=self._json_object_hook)
+            with open(cars_file, 'rb') as f:
+                data = orjson.loads(f.read())
+            for car in data:
+                self._rename_3d_model_url(car)
             print(f"✅ Loaded {len(data)} vehicles from cars.json")
             return data
         except FileNotFoundError:
             print(f"⚠️ Warning: {cars_file} not found")
             return []
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print(f"❌ Error decoding JSON: {e}")
             return []
 
-    def _json_object_hook(self, d):
+    @staticmethod
+    def _build_row_index(column: tuple) -> Dict[Any, tuple]:
+        """Map each value in a column to the rows holding it, in catalog order"""
+        rows_by_value = defaultdict(list)
+        for i, value in enumerate(column):
+            rows_by_value[value].append(i)
+        return {value: tuple(rows) for value, rows in rows_by_value.items()}
+
+    def _rename_3d_model_url(self, d):
         """Renames '3d_model_url' to '_3d_model_url' for consistency with frontend."""
         if '3d_model_url' in d:
             d['_3d_model_url'] = d.pop('3d_model_url')
@@ -34,7 +121,13 @@ class VehicleService:
 
     def get_all_vehicles(self) -> List[Vehicle]:
         """Get all vehicles"""
-        return [Vehicle(**car) for car in self.cars_data]
+        return list(self._get_vehicles())
+
+    def _get_vehicles(self) -> List[Vehicle]:
+        """Validated Vehicle for every row, built on first use"""
+        if self._vehicles is None:
+            self._vehicles = [Vehicle(**car) for car in self.cars_data]
+        return self._vehicles
 
     def find_vehicles(
         self,
@@ -52,84 +145,157 @@ class VehicleService:
 
         This is where your AI agent's tools will call to find cars
         """
-        filtered_cars = self.cars_data
+        vehicles = self._get_vehicles()
+        return [
+            vehicles[i]
+            for i in self._match_rows(model, body_style, fuel_type, max_price, min_mpg, min_seating, year, condition)
+        ]
+
+    def find_vehicle_dicts(
+        self,
+        model: Optional[str] = None,
+        body_style: Optional[str] = None,
+        fuel_type: Optional[str] = None,
+        max_price: Optional[float] = None,
+        min_mpg: Optional[int] = None,
+        min_seating: Optional[int] = None,
+        year: Optional[int] = None,
+        condition: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Same filters as find_vehicles, but returns the raw cars.json entries
+
+        For callers that want plain dicts (e.g. agent tools), this skips the
+        Vehicle round-trip. The dicts are the catalog's own - don't mutate them.
+        """
+        cars = self.cars_data
+        return [
+            cars[i]
+            for i in self._match_rows(model, body_style, fuel_type, max_price, min_mpg, min_seating, year, condition)
+        ]
+
+    def _match_rows(
+        self,
+        model: Optional[str],
+        body_style: Optional[str],
+        fuel_type: Optional[str],
+        max_price: Optional[float],
+        min_mpg: Optional[int],
+        min_seating: Optional[int],
+        year: Optional[int],
+        condition: Optional[str],
+    ) -> tuple:
+        """Normalize the find_vehicles filters and return the matching rows"""
+        target_condition = None
+        if condition:
+            # Map frontend status values to actual condition values in the data
+            # The data has conditions: "New" and "Used"
+            condition_map = {
+                "Used": "Used",
+                "New": "New",
+                "Certified Pre-Owned": "Used"  # CPO is also treated as used
+            }
+            target_condition = condition_map.get(condition, condition)
+
+        # Normalize to the filter key: text lowercased (every text filter is
+        # case-insensitive) and unset filters as None
+        filter_key = (
+            sys.intern(model.lower()) if model else None,
+            sys.intern(body_style.lower()) if body_style else None,
+            sys.intern(fuel_type.lower()) if fuel_type else None,
+            max_price or None,
+            min_mpg or None,
+            min_seating or None,
+            year or None,
+            sys.intern(target_condition.strip().lower()) if condition else None,
+        )
+        try:
+            rows = self._find_rows_cached(*filter_key)
+        except TypeError:
+            # Unhashable filter value - run the search without the cache
+            rows = self._find_rows(*filter_key)
+
+        if condition:
+            print(f"🔍 Filtering by condition: '{condition}' -> '{target_condition}', found {len(rows)} cars")
+
+        return rows
+
+    def _find_rows(
+        self,
+        model: Optional[str],
+        body_style: Optional[str],
+        fuel_type: Optional[str],
+        max_price: Optional[float],
+        min_mpg: Optional[int],
+        min_seating: Optional[int],
+        year: Optional[int],
+        condition: Optional[str],
+    ) -> tuple:
+        """Rows matching a normalized filter key (see find_vehicles), in catalog order"""
+        total = len(self.cars_data)
+
+        # Collect the active filters as (rows kept, column, test, target, matching
+        # rows). Only equality filters know their matching rows up front.
+        filters = []
 
         # Filter by model
         if model:
-            filtered_cars = [
-                car for car in filtered_cars
-                if car.get("model", "").lower() == model.lower()
-            ]
+            matches = self._model_rows.get(model, ())
+            filters.append((len(matches), self._model_lc, eq, model, matches))
 
         # Filter by body style
         if body_style:
-            filtered_cars = [
-                car for car in filtered_cars
-                if car.get("specs", {}).get("body_style", "").lower() == body_style.lower()
-            ]
+            matches = self._body_rows.get(body_style, ())
+            filters.append((len(matches), self._body_lc, eq, body_style, matches))
 
         # Filter by fuel type
         if fuel_type:
-            filtered_cars = [
-                car for car in filtered_cars
-                if car.get("specs", {}).get("powertrain", {}).get("fuel_type", "").lower() == fuel_type.lower()
-            ]
+            matches = self._fuel_rows.get(fuel_type, ())
+            filters.append((len(matches), self._fuel_lc, eq, fuel_type, matches))
 
         # Filter by max price
         if max_price:
-            filtered_cars = [
-                car for car in filtered_cars
-                if car.get("specs", {}).get("pricing", {}).get("base_msrp", float('inf')) <= max_price
-            ]
+            filters.append((bisect_right(self._sorted_price, max_price), self._price, le, max_price, None))
 
         # Filter by minimum highway MPG
         if min_mpg:
-            filtered_cars = [
-                car for car in filtered_cars
-                if car.get("specs", {}).get("powertrain", {}).get("mpg_hwy", 0) >= min_mpg
-            ]
+            filters.append((total - bisect_left(self._sorted_mpg_hwy, min_mpg), self._mpg_hwy, ge, min_mpg, None))
 
         # Filter by minimum seating
         if min_seating:
-            filtered_cars = [
-                car for car in filtered_cars
-                if car.get("specs", {}).get("capacity", {}).get("seats", 0) >= min_seating
-            ]
+            filters.append((total - bisect_left(self._sorted_seats, min_seating), self._seats, ge, min_seating, None))
 
         # Filter by year
         if year:
-            filtered_cars = [
-                car for car in filtered_cars
-                if car.get("year") == year
-            ]
+            matches = self._year_rows.get(year, ())
+            filters.append((len(matches), self._year, eq, year, matches))
 
-        # Filter by condition
-        if condition:
-            # Map frontend status values to actual condition values in the data
-            # The data has conditions: "New" and "Used"
-            condition_map = {
-                "Used": "Used",
-                "New": "New",
-                "Certified Pre-Owned": "Used"  # CPO is also treated as used
-            }
-            target_condition = condition_map.get(condition, condition)
-            
-            # Filter cars by condition (case-insensitive comparison for robustness)
-            filtered_cars = [
-                car for car in filtered_cars
-                if car.get("condition", "").strip().lower() == target_condition.strip().lower()
-            ]
-            
-            print(f"🔍 Filtering by condition: '{condition}' -> '{target_condition}', found {len(filtered_cars)} cars")
+        # Filter by condition (may be "" after stripping, which matches nothing)
+        if condition is not None:
+            matches = self._condition_rows.get(condition, ())
+            filters.append((len(matches), self._condition_lc, eq, condition, matches))
 
-        return [Vehicle(**car) for car in filtered_cars]
+        # Apply the most selective filter first so later ones see fewer rows.
+        # An equality filter is answered straight from its index.
+        filters.sort(key=lambda f: f[0])
+        if filters and filters[0][4] is not None:
+            rows = filters.pop(0)[4]
+        else:
+            rows = range(total)
+        if filters:
+            row_filter = _compile_row_filter(tuple(test for _, _, test, _, _ in filters))
+            rows = row_filter(rows, *[arg for _, column, _, target, _ in filters for arg in (column, target)])
+        return tuple(rows)
 
     def get_vehicle_by_id(self, vehicle_id: str) -> Optional[Vehicle]:
         """Get a specific vehicle by ID"""
-        for car in self.cars_data:
-            if car.get("id") == vehicle_id:
-                return Vehicle(**car)
-        return None
+        row = self._row_by_id.get(vehicle_id)
+        return self._get_vehicles()[row] if row is not None else None
+
+    def get_vehicle_dict(self, vehicle_id: str) -> Optional[Dict[str, Any]]:
+        """Raw cars.json entry for a vehicle ID (shared with the catalog - don't mutate)"""
+        row = self._row_by_id.get(vehicle_id)
+        return self.cars_data[row] if row is not None else None
 
     def calculate_true_cost(
         self,
@@ -142,72 +308,138 @@ class VehicleService:
 
         Example tool that your AI agent could use
         """
-        vehicle = self.get_vehicle_by_id(vehicle_id)
-        if not vehicle:
+        try:
+            result = self._true_cost_cached(vehicle_id, commute_miles, gas_price)
+        except TypeError:
+            # Unhashable argument - compute without the cache
+            result = self._calculate_true_cost(vehicle_id, commute_miles, gas_price)
+        # Hand out a copy so callers can't alter the cached breakdown
+        return dict(result)
+
+    def _calculate_true_cost(self, vehicle_id: str, commute_miles: int, gas_price: float) -> Dict[str, Any]:
+        """Cost breakdown behind calculate_true_cost (memoized per instance)"""
+        row = self._row_by_id.get(vehicle_id)
+        if row is None:
             return {"error": "Vehicle not found"}
 
         # Annual fuel cost calculation
         annual_miles = commute_miles * 2 * 250  # Round trip, 250 work days
+        return self._true_cost_breakdown(row, annual_miles, gas_price)
 
-        mpg_hwy = vehicle.specs.powertrain.mpg_hwy
+    def calculate_true_cost_bulk(
+        self,
+        vehicle_ids: List[str],
+        commute_miles: int,
+        gas_price: float = 3.50
+    ) -> List[Dict[str, Any]]:
+        """
+        Calculate true cost of ownership for several vehicles at once
+
+        Same breakdown as calculate_true_cost, in the order of vehicle_ids, for
+        one shared commute and gas price (e.g. when comparing a shortlist).
+        """
+        annual_miles = commute_miles * 2 * 250  # Round trip, 250 work days
+        row_by_id = self._row_by_id
+        results = []
+        for vehicle_id in vehicle_ids:
+            row = row_by_id.get(vehicle_id)
+            if row is None:
+                results.append({"error": "Vehicle not found"})
+            else:
+                results.append(self._true_cost_breakdown(row, annual_miles, gas_price))
+        return results
+
+    def _get_cost_rows(self) -> List[tuple]:
+        """
+        Flat (display name, year, base_msrp, mpg_hwy, annual_insurance,
+        annual_maintenance) per row
+        
+        Read off the validated vehicles (so values keep the Vehicle field types)
+        on first use, sparing each breakdown the nested attribute walks and the
+        display-name formatting.
+        """
+        if self._cost_rows is None:
+            self._cost_rows = [
+                (
+                    f"{vehicle.make} {vehicle.model} {vehicle.trim}",
+                    vehicle.year,
+                    vehicle.specs.pricing.base_msrp,
+                    vehicle.specs.powertrain.mpg_hwy,
+                    vehicle.annual_insurance,
+                    vehicle.annual_maintenance,
+                )
+                for vehicle in self._get_vehicles()
+            ]
+        return self._cost_rows
+
+    def _true_cost_breakdown(self, row: int, annual_miles: int, gas_price: float) -> Dict[str, Any]:
+        """Ownership cost breakdown for one catalog row over the given annual mileage"""
+        vehicle_name, year, base_msrp, mpg_hwy, annual_insurance, annual_maintenance = self._get_cost_rows()[row]
         if mpg_hwy:
             annual_gallons = annual_miles / mpg_hwy
             annual_fuel_cost = annual_gallons * gas_price
         else:
             annual_fuel_cost = 0
 
-        # Include other annual costs
-        annual_insurance = vehicle.annual_insurance
-        annual_maintenance = vehicle.annual_maintenance
-
         return {
-            "vehicle_name": f"{vehicle.make} {vehicle.model} {vehicle.trim}",
-            "year": vehicle.year,
-            "msrp": vehicle.specs.pricing.base_msrp,
+            "vehicle_name": vehicle_name,
+            "year": year,
+            "msrp": base_msrp,
             "annual_fuel_cost": round(annual_fuel_cost, 2),
             "annual_insurance": round(annual_insurance, 2),
             "annual_maintenance": round(annual_maintenance, 2),
             "total_annual_cost": round(annual_fuel_cost + annual_insurance + annual_maintenance, 2),
             "five_year_fuel_cost": round(annual_fuel_cost * 5, 2),
             "five_year_total": round(
-                vehicle.specs.pricing.base_msrp + 
+                base_msrp + 
                 (annual_fuel_cost + annual_insurance + annual_maintenance) * 5, 
                 2
             ),
         }
 
     def get_catalog_stats(self) -> Dict[str, Any]:
-        """Get statistics about the vehicle catalog"""
-        body_styles = {}
-        fuel_types = {}
-        years = set()
-        price_range = {"min": float('inf'), "max": 0}
+        """Get statistics about the vehicle catalog (computed once, treat as read-only)"""
+        if self._catalog_stats is None:
+            self._catalog_stats = self._compute_catalog_stats()
+        return self._catalog_stats
+
+    def _compute_catalog_stats(self) -> Dict[str, Any]:
+        """Count body styles and fuel types and collect years and price range"""
+        specs = [car.get("specs", {}) for car in self.cars_data]
+        body_styles = Counter(spec.get("body_style", "unknown") for spec in specs)
+        fuel_types = Counter(spec.get("powertrain", {}).get("fuel_type", "unknown") for spec in specs)
         
-        for car in self.cars_data:
-            # Count by body style
-            body_style = car.get("specs", {}).get("body_style", "unknown")
-            body_styles[body_style] = body_styles.get(body_style, 0) + 1
-            
-            # Count by fuel type
-            fuel_type = car.get("specs", {}).get("powertrain", {}).get("fuel_type", "unknown")
-            fuel_types[fuel_type] = fuel_types.get(fuel_type, 0) + 1
-            
-            # Track years
-            years.add(car.get("year"))
-            
-            # Track price range
-            price = car.get("specs", {}).get("pricing", {}).get("base_msrp", 0)
-            if price > 0:
-                price_range["min"] = min(price_range["min"], price)
-                price_range["max"] = max(price_range["max"], price)
+        # Price range over cars with a known, positive price (the price column
+        # holds inf for a missing MSRP)
+        prices = [price for price in self._price if 0 < price < float('inf')]
+        price_range = {"min": min(prices, default=float('inf')), "max": max(prices, default=0)}
         
         return {
             "total_vehicles": len(self.cars_data),
-            "body_styles": body_styles,
-            "fuel_types": fuel_types,
-            "years": sorted(list(years)),
+            "body_styles": dict(body_styles),
+            "fuel_types": dict(fuel_types),
+            "years": sorted(set(self._year)),
             "price_range": price_range,
         }
 
-# Singleton instance
-vehicle_service = VehicleService()
+# Singleton instance (created on first use so importing this module does no I/O).
+# Tools run on worker threads, so construction is locked to load the catalog once.
+_vehicle_service: Optional[VehicleService] = None
+_vehicle_service_lock = threading.Lock()
+
+
+def get_vehicle_service() -> VehicleService:
+    """Get the shared VehicleService, loading cars.json on first call"""
+    global _vehicle_service
+    if _vehicle_service is None:
+        with _vehicle_service_lock:
+            if _vehicle_service is None:
+                _vehicle_service = VehicleService()
+    return _vehicle_service
+
+
+def __getattr__(name: str) -> Any:
+    """Resolve the legacy `vehicle_service` attribute lazily (PEP 562)"""
+    if name == "vehicle_service":
+        return get_vehicle_service()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -10,7 +10,15 @@ Example:
 """
 
 from typing import List, Dict, Any
-from app.services.vehicle_service import vehicle_service
+from app.services.vehicle_service import get_vehicle_service
+
+# find_cars vehicle types that are catalog fuel types (the catalog has no
+# battery-electric cars, so "electric" means its plug-in hybrids)
+_FUEL_TYPES_BY_VEHICLE_TYPE = {
+    "hybrid": "hybrid",
+    "electric": "plug-in hybrid",
+    "plug-in hybrid": "plug-in hybrid",
+}
 
 def find_cars(
     vehicle_type: str | None = None,
@@ -30,15 +38,18 @@ def find_cars(
     Returns:
         List of matching vehicles with details
     """
-    vehicles = vehicle_service.find_vehicles(
-        vehicle_type=vehicle_type,
+    # Hybrid and electric are fuel types in the catalog, the rest are body styles
+    fuel_type = _FUEL_TYPES_BY_VEHICLE_TYPE.get(vehicle_type.lower()) if vehicle_type else None
+    body_style = None if fuel_type else vehicle_type
+    
+    # Raw catalog dicts (same shape as Vehicle.model_dump()) for LangChain
+    return get_vehicle_service().find_vehicle_dicts(
+        body_style=body_style,
+        fuel_type=fuel_type,
         max_price=max_price,
         min_mpg=min_mpg,
         min_seating=min_seating,
     )
-    
-    # Convert to dict for LangChain
-    return [vehicle.model_dump() for vehicle in vehicles]
 
 
 def calculate_true_cost(
@@ -57,7 +68,7 @@ def calculate_true_cost(
     Returns:
         Cost breakdown including MSRP, fuel costs, and 5-year total
     """
-    return vehicle_service.calculate_true_cost(
+    return get_vehicle_service().calculate_true_cost(
         vehicle_id=vehicle_id,
         commute_miles=commute_miles,
         gas_price=gas_price,
@@ -74,8 +85,8 @@ def get_vehicle_details(vehicle_id: str) -> Dict[str, Any] | None:
     Returns:
         Vehicle details or None if not found
     """
-    vehicle = vehicle_service.get_vehicle_by_id(vehicle_id)
-    return vehicle.model_dump() if vehicle else None
+    # Raw catalog dict (same shape as Vehicle.model_dump())
+    return get_vehicle_service().get_vehicle_dict(vehicle_id)
 
 
 # TODO: Add these tools to your LangChain agent
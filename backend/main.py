@@ -1,5 +1,6 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from app.core.config import settings
 from app.api import chat, vehicles, scoring
 
@@ -7,6 +8,7 @@ app = FastAPI(
     title="Toyota AI Assistant API",
     description="AI-powered chatbot for Toyota vehicle recommendations",
     version="1.0.0",
+    default_response_class=ORJSONResponse,  # orjson encodes the large vehicle lists much faster
 )
 
 # Configure CORS
@@ -5,7 +5,7 @@ Run this with:
   docker compose -f docker-compose.dev.yml exec backend python test_catalog_scoring.py
 """
 
-from app.services.catalog_scoring import catalog_scoring_service
+from app.services.catalog_scoring import CatalogScoringService, catalog_scoring_service, _FUEL_CODES
 
 
 def test_get_all_cars():
@@ -151,12 +151,49 @@ def test_json_output():
     print()
 
 
+
+def test_limit_matches_full_ranking():
+    """Test that a limited ranking is the head of the full ranking"""
+    print("=" * 60)
+    print("TEST 6: Limited Rankings Match the Full Ranking")
+    print("=" * 60)
+    
+    # Tight budgets push most of the catalog over 1.5x the budget, which is
+    # where the limited ranking skips cars it can prove won't make the cut
+    profiles = [
+        {},
+        {"budget_max": 15000},
+        {"budget_max": 20000, "priorities": ["performance"], "weights": {"budget": 0.0, "performance": 0.6}},
+        {"budget_max": 25000, "commute_miles": 60, "features_wanted": ["hybrid", "apple_carplay"]},
+        {"budget_max": 35000, "passengers": 8, "terrain": "mixed",
+         "priorities": ["budget", "fuel_efficiency", "performance"], "top_priority": "safety"},
+        {"budget_max": 20000, "vehicle_type": "suv", "has_children": True, "budget_flexible": True},
+        {"budget_max": 20000, "features_wanted": ["hybrid electric"], "weights": {"features": 0.9}},
+    ]
+    
+    # Every car a plug-in hybrid, so "hybrid electric" matches twice per car
+    # and the features score goes past 1.0
+    plug_in_service = CatalogScoringService()
+    for record in plug_in_service._records:
+        record.fuel_code = _FUEL_CODES["plug_in_hybrid"]
+    
+    for service in (catalog_scoring_service, plug_in_service):
+        for user_profile in profiles:
+            full_ranking = service.score_cars_for_user(user_profile)
+            for limit in (1, 3, 5, 10, 20):
+                assert service.score_cars_for_user(user_profile, limit=limit) == full_ranking[:limit], (user_profile, limit)
+    
+    print(f"✓ {len(profiles)} profiles match the full ranking at every limit")
+    print()
+
+
 if __name__ == "__main__":
     test_get_all_cars()
     test_scoring_family_profile()
     test_scoring_eco_profile()
     test_scoring_offroad_profile()
     test_json_output()
+    test_limit_matches_full_ranking()
     
     print("=" * 60)
     print("✅ All tests completed successfully!")
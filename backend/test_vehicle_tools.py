@@ -0,0 +1,51 @@
+"""
+Test script for the vehicle search tools
+
+Run this with:
+  docker compose -f docker-compose.dev.yml exec backend python test_vehicle_tools.py
+"""
+
+from app.tools.vehicle_tools import find_cars
+
+
+def test_find_cars_by_body_style():
+    """Test that body-style vehicle types filter on body_style"""
+    print("=" * 60)
+    print("TEST 1: Find Cars by Body Style")
+    print("=" * 60)
+    
+    for vehicle_type in ("sedan", "SUV", "truck"):
+        cars = find_cars(vehicle_type=vehicle_type)
+        assert cars, vehicle_type
+        assert all(car["specs"]["body_style"].lower() == vehicle_type.lower() for car in cars), vehicle_type
+        print(f"✓ {vehicle_type}: {len(cars)} cars")
+    
+    print()
+
+
+def test_find_cars_by_fuel_type():
+    """Test that hybrid/electric vehicle types filter on fuel type"""
+    print("=" * 60)
+    print("TEST 2: Find Cars by Fuel Type")
+    print("=" * 60)
+    
+    # The catalog has no battery-electric cars, so "electric" finds its plug-in hybrids
+    expected_fuel_types = {
+        "hybrid": "hybrid",
+        "Electric": "plug-in hybrid",
+        "plug-in hybrid": "plug-in hybrid",
+    }
+    
+    for vehicle_type, fuel_type in expected_fuel_types.items():
+        cars = find_cars(vehicle_type=vehicle_type, max_price=60000)
+        assert cars, vehicle_type
+        assert all(car["specs"]["powertrain"]["fuel_type"] == fuel_type for car in cars), vehicle_type
+        assert all(car["specs"]["pricing"]["base_msrp"] <= 60000 for car in cars), vehicle_type
+        print(f"✓ {vehicle_type}: {len(cars)} cars ({fuel_type})")
+    
+    print()
+
+
+if __name__ == "__main__":
+    test_find_cars_by_body_style()
+    test_find_cars_by_fuel_type()
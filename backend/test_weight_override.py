@@ -6,7 +6,6 @@ based on what the user emphasizes in conversation.
 """
 
 from app.services.catalog_scoring import catalog_scoring_service
-import json
 
 
 def test_default_weights():
@@ -126,7 +125,7 @@ def test_performance_priority():
     for i, result in enumerate(scored_cars[:3], 1):
         print(f"  {i}. {result['id']}: {result['score']}")
         # Check horsepower
-        car = next(c for c in catalog_scoring_service.get_all_cars() if c['id'] == result['id'])
+        car = catalog_scoring_service.get_car_by_id(result['id'])
         print(f"      → {car['horsepower']} HP")
     
     print("\n")
@@ -169,7 +168,7 @@ def test_budget_not_important():
     
     print("Top 3 Recommendations:")
     for i, result in enumerate(scored_cars[:3], 1):
-        car = next(c for c in catalog_scoring_service.get_all_cars() if c['id'] == result['id'])
+        car = catalog_scoring_service.get_car_by_id(result['id'])
         print(f"  {i}. {result['id']}: {result['score']}")
         print(f"      → ${car['price']:,}, {car['seating']} seats")
     
@@ -211,7 +210,7 @@ def test_feature_focused():
     
     print("Top 3 Recommendations:")
     for i, result in enumerate(scored_cars[:3], 1):
-        car = next(c for c in catalog_scoring_service.get_all_cars() if c['id'] == result['id'])
+        car = catalog_scoring_service.get_car_by_id(result['id'])
         print(f"  {i}. {result['id']}: {result['score']}")
         print(f"      Features: {', '.join(car['features'][:3])}...")
     
@@ -6,8 +6,8 @@ echo ""
 
 # Check if backend is running
 echo "📡 Checking backend health..."
-health=$(curl -s http://localhost:8000/health)
-if [ "$health" != '{"status":"healthy"}' ]; then
+health=$(curl -s --max-time 5 http://localhost:8000/health | jq -r '.status' 2>/dev/null)
+if [ "$health" != "healthy" ]; then
     echo "❌ Backend is not running. Please start it first:"
     echo "   docker compose -f docker-compose.dev.yml up --build backend"
     exit 1